@@ -0,0 +1,100 @@
+import json
+import sys
+import time
+
+import numpy as np
+
+import exercicio1
+import exercicio2
+import exercicio3
+from exatos import mochila_exata, tsp_exato
+from polimento import polir_rota
+
+# --------------------------------------------------------------------------
+# BENCHMARK: RECOZIMENTO x SOLUÇÃO ÓTIMA
+# --------------------------------------------------------------------------
+#
+# Para cada problema, passos e semente: roda o anneal() e mede passos/s,
+# se chegou ao ótimo e em quanto tempo (pelo passo da última melhora, ou o
+# tempo total quando há pós-processamento, como o polimento da rota).
+# A saída é JSON, para comparar versões do código por números.
+
+def otimo_com_um_de(pesos, valores, capacidade, obrigatorios):
+    """Ótimo da mochila exigindo ao menos um dos itens `obrigatorios`."""
+    melhor = -np.inf
+    for i in obrigatorios:
+        resto = [j for j in range(len(pesos)) if j != i]
+        _, valor = mochila_exata(pesos[resto], valores[resto], capacidade - pesos[i])
+        melhor = max(melhor, valor + valores[i])
+    return melhor
+
+def problemas():
+    """
+    (nome, fabrica do annealer, energia ótima, Tmax, Tmin, pos_processamento)
+    de cada instância. pos_processamento recebe o melhor estado e devolve
+    (estado, energia), ou é None.
+    """
+    _, gosto = mochila_exata(exercicio1.precos, exercicio1.gostos, exercicio1.BUDGET_MAX)
+    gosto_1a = otimo_com_um_de(exercicio1.precos, exercicio1.gostos, exercicio1.BUDGET_MAX, [0, 1])
+    _, distancia = tsp_exato(exercicio2.dist_km, exercicio2.start_idx)
+    _, interesse = mochila_exata(exercicio3.duracoes, exercicio3.interesses,
+                                 exercicio3.CAPACIDADE_HORAS, escala=100)
+    rota = list(range(1, len(exercicio2.stadiums)))
+    polir = lambda estado: polir_rota(estado, exercicio2.dist_km, exercicio2.start_idx)
+    return [
+        ("ShowAnnealer", lambda: exercicio1.ShowAnnealer([]), -gosto, 25000, 2.5, None),
+        ("ShowAnnealerConstrained", lambda: exercicio1.ShowAnnealerConstrained([]), -gosto_1a, 25000, 2.5, None),
+        ("TSPAnnealer", lambda: exercicio2.TSPAnnealer(rota), distancia, 1000000, 0.1, None),
+        ("TSPAnnealer+polimento", lambda: exercicio2.TSPAnnealer(rota), distancia, 1000000, 0.1, polir),
+        ("AnimeAnnealer", lambda: exercicio3.AnimeAnnealer([]), -interesse, 25000, 2.5, None),
+    ]
+
+def rodar_benchmark(passos=(1000, 5000, 50000), sementes=range(10), tolerancia=1e-6):
+    """Retorna uma lista de dicts (um por problema e número de passos)."""
+    resultados = []
+    for nome, fabrica, otimo, Tmax, Tmin, pos_processamento in problemas():
+        for steps in passos:
+            taxas, tempos_ate_otimo, sucessos, energias = [], [], 0, []
+            for semente in sementes:
+                annealer = fabrica()
+                annealer.seed(semente)
+                inicio = time.perf_counter()
+                estado, energia = annealer.anneal(Tmax=Tmax, Tmin=Tmin, steps=steps, updates=0)
+                duracao = time.perf_counter() - inicio
+                if pos_processamento is not None:
+                    estado, energia = pos_processamento(estado)
+                duracao_total = time.perf_counter() - inicio
+
+                taxas.append(annealer.passos_executados / duracao)
+                energias.append(energia)
+                if energia <= otimo + tolerancia:
+                    sucessos += 1
+                    if pos_processamento is None:
+                        tempos_ate_otimo.append(duracao * annealer.passo_do_melhor / annealer.passos_executados)
+                    else:
+                        # O ótimo só é garantido ao fim do pós-processamento:
+                        # conta o recozimento inteiro mais o pós-processamento
+                        tempos_ate_otimo.append(duracao_total)
+
+            resultados.append({
+                "problema": nome,
+                "passos": steps,
+                "sementes": len(energias),
+                "energia_otima": otimo,
+                "energia_media": float(np.mean(energias)),
+                "melhor_energia": float(np.min(energias)),
+                "taxa_sucesso": sucessos / len(energias),
+                "passos_por_segundo": float(np.median(taxas)),
+                "tempo_ate_otimo_s": float(np.median(tempos_ate_otimo)) if tempos_ate_otimo else None,
+            })
+    return resultados
+
+if __name__ == "__main__":
+    # Uso: python benchmark.py [saida.json]
+    resultados = rodar_benchmark()
+    texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w", encoding="utf-8") as f:
+            f.write(texto)
+    else:
+        print(texto)
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# --------------------------------------------------------------------------
+# CACHE DE ENERGIA PARA PROBLEMAS DE SUBCONJUNTO (chave = máscara de bits)
+# --------------------------------------------------------------------------
+
+# Até quantos itens vale montar a tabela completa (2^n energias)
+MAX_ITENS_TABELA = 20
+
+class TabelaEnergia:
+    """
+    Tabela densa com a energia de TODOS os 2^n subconjuntos, montada de uma
+    vez com NumPy. Consultar é só indexar pela máscara.
+
+    Segue a mesma regra do KnapsackAnnealer: -valor se couber e tiver ao
+    menos um dos `obrigatorios`; 1.0 caso contrário.
+
+    hits/misses seguem o sentido da CacheLRU: a primeira consulta de cada
+    subconjunto conta como miss (seria um cálculo), as seguintes como hit.
+    """
+
+    def __init__(self, pesos, valores, capacidade, obrigatorios=()):
+        n = len(pesos)
+        if n > MAX_ITENS_TABELA:
+            raise ValueError(f"Tabela densa limitada a {MAX_ITENS_TABELA} itens (recebeu {n}).")
+
+        # Somas de todos os subconjuntos: a cada item, a tabela dobra
+        # (sem o item | com o item), e o bit i da máscara é o item i.
+        W = np.zeros(1)
+        V = np.zeros(1)
+        for i in range(n):
+            W = np.concatenate((W, W + pesos[i]))
+            V = np.concatenate((V, V + valores[i]))
+
+        valido = W <= capacidade
+        if obrigatorios:
+            mascara_obrigatorios = sum(1 << i for i in obrigatorios)
+            valido &= (np.arange(1 << n) & mascara_obrigatorios) != 0
+        self.energias = np.where(valido, -V, 1.0).tolist()
+        self._visto = bytearray(1 << n)
+        self.hits = 0
+        self.misses = 0
+
+    def obter(self, mascara, calcular):
+        if self._visto[mascara]:
+            self.hits += 1
+        else:
+            self._visto[mascara] = 1
+            self.misses += 1
+        return self.energias[mascara]
+
+class CacheLRU:
+    """
+    Cache limitado (LRU) de energias por máscara.
+    `calcular` é chamado só quando a máscara não está no cache.
+
+    Só compensa se `calcular` for caro: a energia do KnapsackAnnealer já é
+    O(1) (totais acumulados no SubsetState), e a consulta ao OrderedDict
+    custa mais que ela. Por isso criar_cache() não a escolhe sozinha.
+    Acima de 64 itens a chave é um hash de Zobrist de 64 bits (ver
+    subconjunto.py), com chance desprezível de colisão.
+    """
+
+    def __init__(self, tamanho=100000):
+        self.tamanho = tamanho
+        self._dados = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def obter(self, mascara, calcular):
+        dados = self._dados
+        if mascara in dados:
+            self.hits += 1
+            dados.move_to_end(mascara)
+            return dados[mascara]
+        self.misses += 1
+        energia = calcular()
+        dados[mascara] = energia
+        if len(dados) > self.tamanho:
+            dados.popitem(last=False)
+        return energia
+
+def criar_cache(pesos, valores, capacidade, obrigatorios=()):
+    """
+    Tabela densa para até MAX_ITENS_TABELA itens; para mais itens devolve
+    None (sem cache), pois a energia já é O(1) e uma LRU só atrasaria.
+    """
+    if len(pesos) <= MAX_ITENS_TABELA:
+        return TabelaEnergia(pesos, valores, capacidade, obrigatorios)
+    return None
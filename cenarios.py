@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+
+from mochila import KnapsackAnnealer
+
+# --------------------------------------------------------------------------
+# VARREDURA DE CENÁRIOS "E SE" COM PARTIDA A QUENTE
+# --------------------------------------------------------------------------
+#
+# Um cenário é um dict com a capacidade e, opcionalmente, restrições:
+#     {"capacidade": 3000, "obrigatorios": (0, 1), "proibidos": (7,)}
+# (o Exercício 1.a é o cenário {"capacidade": 3000, "obrigatorios": (0, 1)}).
+#
+# Todos os cenários usam os mesmos arrays de pesos/valores e o mesmo índice
+# ordenado por peso. Cada cenário parte da solução do cenário já resolvido
+# mais parecido, reparada para as novas restrições, e com um resfriamento
+# mais curto e mais frio do que a partida do zero.
+
+def distancia_cenarios(a, b):
+    """Quão diferentes são dois cenários (capacidade + restrições)."""
+    diferencas = (len(set(a.get("obrigatorios", ())) ^ set(b.get("obrigatorios", ())))
+                  + len(set(a.get("proibidos", ())) ^ set(b.get("proibidos", ()))))
+    return abs(a["capacidade"] - b["capacidade"]) + diferencas * a["capacidade"]
+
+def varrer_cenarios(pesos, valores, cenarios, Tmax=25, Tmin=0.5, steps=50000,
+                    Tmax_morno=None, steps_morno=None, semente=0):
+    """
+    Resolve cada cenário e devolve os resultados conforme terminam (gerador).
+
+    O primeiro cenário (na ordem de capacidade) parte do zero com
+    Tmax/Tmin/steps. Os demais partem a quente, com Tmax_morno (padrão:
+    Tmax / 10) e steps_morno (padrão: steps / 5).
+
+    Cada item gerado é (indice_do_cenario, melhor_estado, melhor_energia, segundos).
+    """
+    pesos = np.asarray(pesos, dtype=np.float64)
+    valores = np.asarray(valores, dtype=np.float64)
+    ordem_peso = np.argsort(pesos, kind="stable")
+    if Tmax_morno is None:
+        Tmax_morno = max(Tmax / 10.0, Tmin * 1.01)
+    if steps_morno is None:
+        steps_morno = max(1, steps // 5)
+
+    resolvidos = [] # (cenario, melhor_estado)
+    ordem = sorted(range(len(cenarios)), key=lambda k: cenarios[k]["capacidade"])
+    for k in ordem:
+        cenario = cenarios[k]
+        inicio = time.perf_counter()
+
+        if resolvidos:
+            _, estado = min(resolvidos, key=lambda r: distancia_cenarios(cenario, r[0]))
+            T0, passos = Tmax_morno, steps_morno
+        else:
+            estado = ()
+            T0, passos = Tmax, steps
+
+        # O construtor repara o estado: tira proibidos, garante obrigatório
+        # e remove os itens de pior valor/peso até caber
+        annealer = KnapsackAnnealer(pesos, valores, cenario["capacidade"], estado,
+                                    obrigatorios=cenario.get("obrigatorios", ()),
+                                    proibidos=cenario.get("proibidos", ()),
+                                    ordem_peso=ordem_peso)
+        annealer.seed(semente + k)
+        melhor_estado, melhor_energia = annealer.anneal(Tmax=T0, Tmin=Tmin, steps=passos)
+
+        resolvidos.append((cenario, melhor_estado))
+        yield k, melhor_estado, melhor_energia, time.perf_counter() - inicio
+
+# --------------------------------------------------------------------------
+# EXEMPLO: orçamentos de R$ 1000 a R$ 10000 do Exercício 1 (+ o 1.a)
+# --------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import exercicio1
+
+    cenarios = [{"capacidade": float(b)} for b in range(1000, 10001, 1000)]
+    cenarios.append({"capacidade": exercicio1.BUDGET_MAX, "obrigatorios": (0, 1)})
+
+    for k, estado, energia, segundos in varrer_cenarios(
+            exercicio1.precos, exercicio1.gostos, cenarios, steps=20000):
+        print(f"Cenário {k:2d} {cenarios[k]}: gosto {-energia:.2f} "
+              f"({len(estado)} shows, {segundos * 1000:.0f} ms)")
@@ -0,0 +1,78 @@
+import numpy as np
+
+# --------------------------------------------------------------------------
+# SOLUÇÕES EXATAS (referência para medir a qualidade do recozimento)
+# --------------------------------------------------------------------------
+
+def mochila_exata(pesos, valores, capacidade, escala=1):
+    """
+    Mochila 0/1 por programação dinâmica sobre a capacidade.
+
+    Os pesos precisam ser inteiros depois de multiplicados por `escala`
+    (ex.: escala=100 para durações com 2 casas decimais).
+    Retorna (indices_escolhidos, valor_total).
+    """
+    w = np.rint(np.asarray(pesos, dtype=np.float64) * escala).astype(np.int64)
+    v = np.asarray(valores, dtype=np.float64)
+    C = int(np.floor(capacidade * escala + 1e-9))
+
+    # melhor[c] = maior valor com peso total <= c
+    melhor = np.zeros(C + 1)
+    pegou = np.zeros((len(w), C + 1), dtype=bool)
+    for i in range(len(w)):
+        if w[i] > C:
+            continue
+        com_item = melhor[:C + 1 - w[i]] + v[i]
+        pegou[i, w[i]:] = com_item > melhor[w[i]:]
+        melhor[w[i]:] = np.maximum(melhor[w[i]:], com_item)
+
+    # Reconstrói a escolha de trás para frente
+    escolhidos = []
+    c = C
+    for i in range(len(w) - 1, -1, -1):
+        if pegou[i, c]:
+            escolhidos.append(i)
+            c -= w[i]
+    return sorted(escolhidos), float(melhor[C])
+
+def tsp_exato(dist, inicio=0):
+    """
+    Held-Karp: rota ótima que sai de `inicio`, visita todas e volta.
+    O(2^n * n^2); serve para as instâncias pequenas (ex.: 12 estádios).
+    Retorna (rota_sem_o_inicio, distancia_total).
+    """
+    cidades = [c for c in range(len(dist)) if c != inicio]
+    m = len(cidades)
+
+    # custo[(mascara, j)] = menor caminho saindo do início, visitando a
+    # máscara e terminando na cidade cidades[j]; pai guarda o anterior.
+    custo = {}
+    pai = {}
+    for j in range(m):
+        custo[(1 << j, j)] = dist[inicio][cidades[j]]
+        pai[(1 << j, j)] = None
+
+    for mascara in range(1, 1 << m):
+        for j in range(m):
+            if not mascara & (1 << j) or (mascara, j) not in custo:
+                continue
+            base = custo[(mascara, j)]
+            for k in range(m):
+                if mascara & (1 << k):
+                    continue
+                chave = (mascara | (1 << k), k)
+                novo = base + dist[cidades[j]][cidades[k]]
+                if chave not in custo or novo < custo[chave]:
+                    custo[chave] = novo
+                    pai[chave] = j
+
+    cheia = (1 << m) - 1
+    ultimo = min(range(m), key=lambda j: custo[(cheia, j)] + dist[cidades[j]][inicio])
+    distancia = custo[(cheia, ultimo)] + dist[cidades[ultimo]][inicio]
+
+    rota = []
+    mascara, j = cheia, ultimo
+    while j is not None:
+        rota.append(cidades[j])
+        mascara, j = mascara ^ (1 << j), pai[(mascara, j)]
+    return rota[::-1], distancia
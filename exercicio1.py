@@ -1,5 +1,5 @@
-import random
-from simanneal import Annealer
+import numpy as np
+from mochila import KnapsackAnnealer
 
 # --------------------------------------------------------------------------
 # 1. DEFINIÇÃO DO PROBLEMA (Dados do Exercício 1)
@@ -28,73 +28,43 @@ shows = [
 # Orçamento máximo de Maria [cite: 708]
 BUDGET_MAX = 3000.0
 
+# Colunas (arrays NumPy) usadas pelo recozimento genérico da mochila
+precos = np.array([item["preco"] for item in shows], dtype=np.float64)
+gostos = np.array([item["gosto"] for item in shows], dtype=np.float64)
+
 # --------------------------------------------------------------------------
 # 2. CLASSE DA METAHEURÍSTICA (RECOZIMENTO SIMULADO)
 # --------------------------------------------------------------------------
 
-class ShowAnnealer(Annealer):
+class ShowAnnealer(KnapsackAnnealer):
     """
     Implementação do Recozimento Simulado para o problema dos shows.
-    O "estado" (self.state) é uma lista de índices dos shows que Maria irá.
+    O "estado" (self.state) é um SubsetState com os índices dos shows que Maria irá.
+    Movimentos e energia vêm do KnapsackAnnealer (mochila.py).
     """
-    def __init__(self, state):
-        super(ShowAnnealer, self).__init__(state) # Inicia o Annealer com o estado
+    def __init__(self, state, cache=None):
+        # state é a lista inicial de índices escolhidos;
+        # cache="auto" memoriza as energias por máscara (ver cache_energia.py)
+        super(ShowAnnealer, self).__init__(precos, gostos, BUDGET_MAX, state, cache=cache)
 
-    def move(self):
-        """
-        Gera uma solução "vizinha" modificando levemente a atual.
-        Tenta adicionar, remover ou trocar um show aleatoriamente.
-        """
-        # Escolhe uma ação: 0=remover, 1=adicionar, 2=trocar
-        acao = random.randint(0, 2)
-        
-        # Ação 0: Tenta remover um show (se a lista não estiver vazia)
-        if acao == 0 and len(self.state) > 0:
-            idx_remover = random.choice(self.state)
-            self.state.remove(idx_remover)
-            
-        # Ação 1: Tenta adicionar um show
-        elif acao == 1:
-            # Lista de shows que *não* estão no estado atual
-            shows_disponiveis = [i for i in range(len(shows)) if i not in self.state]
-            if shows_disponiveis:
-                idx_adicionar = random.choice(shows_disponiveis)
-                self.state.append(idx_adicionar)
-                
-        # Ação 2: Tenta trocar um show (remove um, adiciona outro)
-        else:
-            # Tenta remover
-            if len(self.state) > 0:
-                idx_remover = random.choice(self.state)
-                self.state.remove(idx_remover)
-            # Tenta adicionar
-            shows_disponiveis = [i for i in range(len(shows)) if i not in self.state]
-            if shows_disponiveis:
-                idx_adicionar = random.choice(shows_disponiveis)
-                self.state.append(idx_adicionar)
+# Exercício 1.a: uma nova classe que HERDA da original e modifica a energia.
+# Fica no nível do módulo para poder ser enviada a outros processos (multistart).
+class ShowAnnealerConstrained(ShowAnnealer):
+    # Os movimentos nunca removem a última das duas, e o estado inicial
+    # recebe a mais barata se não tiver nenhuma (ver KnapsackAnnealer)
+    obrigatorios = (0, 1)
 
     def energy(self):
-        """
-        Calcula a "energia" (custo) da solução.
-        Queremos MAXIMIZAR o "gosto", mas o SA MINIMIZA a energia.
-        Portanto, nossa energia será o 'gosto total negativo'.
-        """
-        total_preco = 0
-        total_gosto = 0
+        # ID da Taylor Swift é 0, Beyoncé é 1
+        taylor_presente = (0 in self.state)
+        beyonce_presente = (1 in self.state)
         
-        for idx in self.state:
-            total_preco += shows[idx]["preco"]
-            total_gosto += shows[idx]["gosto"]
-            
-        # Penalidade: Se estourar o orçamento, a solução é inválida
-        # Damos uma "energia" (custo) muito alta para que o SA a descarte.
-        if total_preco > BUDGET_MAX:
-            # Retorna 1.0 (muito alto, já que queremos valores negativos)
-            return 1.0 
+        # Se NENHUMA das duas estiver, aplica a penalidade máxima
+        if not taylor_presente and not beyonce_presente:
+            return 1.0 # Solução inválida
         
-        # Se for válida, retorna o negativo do gosto total
-        # (pois o SA minimiza, e queremos maximizar o gosto)
-        return -total_gosto
+        # Se ao menos uma estiver, calcula a energia normalmente
+        return super().energy()
 
 # --------------------------------------------------------------------------
 # 3. FUNÇÃO AUXILIAR PARA IMPRIMIR A SOLUÇÃO
@@ -148,19 +118,7 @@ if __name__ == "__main__":
     # "Qual o resultado se Maria não abrisse mão de ir ao menos 
     #  no show da Taylor Swift ou Beyonce?" 
     
-    # Criamos uma nova classe que HERDA da original e modifica a energia
-    class ShowAnnealerConstrained(ShowAnnealer):
-        def energy(self):
-            # ID da Taylor Swift é 0, Beyoncé é 1
-            taylor_presente = (0 in self.state)
-            beyonce_presente = (1 in self.state)
-            
-            # Se NENHUMA das duas estiver, aplica a penalidade máxima
-            if not taylor_presente and not beyonce_presente:
-                return 1.0 # Solução inválida
-            
-            # Se ao menos uma estiver, calcula a energia normalmente
-            return super().energy()
+    # (A classe ShowAnnealerConstrained, definida na seção 2, aplica a restrição)
 
     initial_state_a = [] # Começa do zero
     annealer_a = ShowAnnealerConstrained(initial_state_a)
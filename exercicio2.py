@@ -1,6 +1,7 @@
 import random
 import math
-from simanneal import Annealer
+from recozimento import UndoAnnealer
+from polimento import polir_rota
 
 # --------------------------------------------------------------------------
 # 1. DEFINIÇÃO DO PROBLEMA (Dados do Exercício 2 - PDF Pág. 33)
@@ -45,35 +46,72 @@ start_idx = 0 # Mineirão [cite: 804]
 # 2. CLASSE DA METAHEURÍSTICA (RECOZIMENTO SIMULADO PARA TSP)
 # --------------------------------------------------------------------------
 
-class TSPAnnealer(Annealer):
+class TSPAnnealer(UndoAnnealer):
     """
     Implementação do Recozimento Simulado para o Problema do Caixeiro Viajante.
     O "estado" (self.state) é uma lista da ORDEM de visita dos estádios 
     (sem incluir o Mineirão, que é fixo no início e fim).
     """
 
-    def __init__(self, state):
-        # state é a lista de cidades (índices 1 a 11) em ordem aleatória
+    def __init__(self, state, dist=None, inicio=None):
+        # state é a lista de cidades (índices 1 a 11) em ordem aleatória.
+        # dist/inicio permitem usar outra matriz (padrão: dist_km e start_idx).
+        self.dist = dist_km if dist is None else dist
+        self.inicio = start_idx if inicio is None else inicio
         super(TSPAnnealer, self).__init__(state)
 
+    def chave_calibracao(self):
+        """Com outra matriz, a calibração depende dos dados dela."""
+        if self.dist is dist_km:
+            return super(TSPAnnealer, self).chave_calibracao()
+        return (type(self).__qualname__, self.inicio,
+                hash(tuple(tuple(linha) for linha in self.dist)))
+
     def move(self):
         """
         Gera uma solução "vizinha" fazendo uma troca "2-opt".
         Isso inverte uma seção aleatória da rota, o que é um
         movimento clássico e eficiente para o TSP.
+
+        Retorna a variação da distância (delta). Como a inversão só troca
+        as duas arestas das pontas do trecho, o delta sai em O(1) e o
+        Annealer não precisa chamar energy() (que percorre a rota toda).
         """
-        a = random.randint(0, len(self.state) - 1)
-        b = random.randint(0, len(self.state) - 1)
+        n = len(self.state)
+        # b pode valer n: assim o trecho invertido pode ir até o fim da rota
+        a = self.rng.randint(0, n)
+        b = self.rng.randint(0, n)
         
         # Garante que a < b
         if a > b:
             a, b = b, a
         elif a == b:
-            # Se forem iguais, não faz nada (ou tenta de novo, mas assim é mais simples)
-            return
+            # Se forem iguais, não faz nada (a distância não muda)
+            self._desfazer = (a, b)
+            return 0
+
+        # Cidades nas pontas do trecho state[a:b] e seus vizinhos de fora.
+        # Nas bordas da lista o vizinho é o Mineirão (self.inicio).
+        primeira = self.state[a]
+        ultima = self.state[b - 1]
+        antes = self.state[a - 1] if a > 0 else self.inicio
+        depois = self.state[b] if b < n else self.inicio
+
+        # Arestas novas menos arestas removidas
+        dist = self.dist
+        delta = (dist[antes][ultima] + dist[primeira][depois]
+                 - dist[antes][primeira] - dist[ultima][depois])
 
         # Inverte a sub-lista (o "pedaço" da rota)
         self.state[a:b] = self.state[a:b][::-1]
+        self._desfazer = (a, b)
+
+        return delta
+
+    def undo(self):
+        """Desfaz o último 2-opt invertendo o mesmo trecho de novo."""
+        a, b = self._desfazer
+        self.state[a:b] = self.state[a:b][::-1]
 
     def energy(self):
         """
@@ -82,19 +120,20 @@ class TSPAnnealer(Annealer):
         Queremos MINIMIZAR a distância.
         """
         distance = 0
-        current_city = start_idx
+        current_city = self.inicio
+        dist = self.dist
         
         # 1. Distância do Início (Mineirão) até a primeira cidade da rota
-        distance += dist_km[current_city][self.state[0]]
+        distance += dist[current_city][self.state[0]]
         
         # 2. Distância entre as cidades da rota
         for i in range(len(self.state) - 1):
             city1 = self.state[i]
             city2 = self.state[i+1]
-            distance += dist_km[city1][city2]
+            distance += dist[city1][city2]
             
         # 3. Distância da última cidade da rota de volta ao Início (Mineirão)
-        distance += dist_km[self.state[-1]][current_city]
+        distance += dist[self.state[-1]][current_city]
         
         return distance
 
@@ -155,4 +194,10 @@ if __name__ == "__main__":
     # Rodando com apenas 5000 passos (busca de baixa qualidade)
     route_b, dist_b = annealer_b.anneal(Tmax=1000000, Tmin=0.1, steps=5000)
     
-    print_solution(route_b, dist_b, "Exercício 2.B: Rota com Parâmetros Alterados (steps=5000)")
\ No newline at end of file
+    print_solution(route_b, dist_b, "Exercício 2.B: Rota com Parâmetros Alterados (steps=5000)")
+
+    # Polimento: busca local 2-opt + Or-opt (determinística) a partir da
+    # rota do 2.B. Garante um ótimo local, corrigindo o que faltou resfriar.
+    route_p, dist_p = polir_rota(route_b, dist_km, start_idx)
+
+    print_solution(route_p, dist_p, "Exercício 2.B + Polimento (2-opt/Or-opt)")
\ No newline at end of file
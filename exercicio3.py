@@ -1,5 +1,5 @@
-import random
-from simanneal import Annealer
+import numpy as np
+from mochila import KnapsackAnnealer, reduzir_mochila
 
 # --------------------------------------------------------------------------
 # 1. DEFINIÇÃO DO PROBLEMA (Dados do Exercício 3 - PDF Pág. 34-35)
@@ -39,72 +39,24 @@ animes_data = [
 # Capacidade total de tempo (30 dias * 10 h/dia) [cite: 822]
 CAPACIDADE_HORAS = 300.0
 
+# Colunas (arrays NumPy) usadas pelo recozimento genérico da mochila
+duracoes = np.array([item["duracao"] for item in animes_data], dtype=np.float64)
+interesses = np.array([item["interesse"] for item in animes_data], dtype=np.float64)
+
 # --------------------------------------------------------------------------
 # 2. CLASSE DA METAHEURÍSTICA (RECOZIMENTO SIMULADO)
 # --------------------------------------------------------------------------
 
-class AnimeAnnealer(Annealer):
+class AnimeAnnealer(KnapsackAnnealer):
     """
-    Implementação do Recozimento Simulado para o problema dos Animes.
-    O "estado" (self.state) é uma lista de índices dos animes que Miguel irá assistir.
+    Implementação do Recozimento Simulado para o problema dos animes.
+    O "estado" (self.state) é um SubsetState com os índices dos animes que Miguel irá assistir.
+    Movimentos e energia vêm do KnapsackAnnealer (mochila.py).
     """
-    def __init__(self, state):
-        super(AnimeAnnealer, self).__init__(state) # Inicia o Annealer com o estado
-
-    def move(self):
-        """
-        Gera uma solução "vizinha" modificando levemente a atual.
-        Tenta adicionar, remover ou trocar um anime aleatoriamente.
-        """
-        # Escolhe uma ação: 0=remover, 1=adicionar, 2=trocar
-        acao = random.randint(0, 2)
-        
-        # Ação 0: Tenta remover um anime (se a lista não estiver vazia)
-        if acao == 0 and len(self.state) > 0:
-            idx_remover = random.choice(self.state)
-            self.state.remove(idx_remover)
-            
-        # Ação 1: Tenta adicionar um anime
-        elif acao == 1:
-            # Lista de animes que *não* estão no estado atual
-            animes_disponiveis = [i for i in range(len(animes_data)) if i not in self.state]
-            if animes_disponiveis:
-                idx_adicionar = random.choice(animes_disponiveis)
-                self.state.append(idx_adicionar)
-                
-        # Ação 2: Tenta trocar um anime (remove um, adiciona outro)
-        else:
-            # Tenta remover
-            if len(self.state) > 0:
-                idx_remover = random.choice(self.state)
-                self.state.remove(idx_remover)
-            # Tenta adicionar
-            animes_disponiveis = [i for i in range(len(animes_data)) if i not in self.state]
-            if animes_disponiveis:
-                idx_adicionar = random.choice(animes_disponiveis)
-                self.state.append(idx_adicionar)
-
-    def energy(self):
-        """
-        Calcula a "energia" (custo) da solução.
-        Queremos MAXIMIZAR o "interesse", mas o SA MINIMIZA a energia.
-        Portanto, nossa energia será o 'interesse total negativo'.
-        """
-        total_duracao = 0
-        total_interesse = 0
-        
-        for idx in self.state:
-            total_duracao += animes_data[idx]["duracao"]
-            total_interesse += animes_data[idx]["interesse"]
-            
-        # Penalidade: Se estourar o tempo, a solução é inválida
-        if total_duracao > CAPACIDADE_HORAS:
-            # Retorna 1.0 (muito alto, já que queremos valores negativos)
-            return 1.0 
-        
-        # Se for válida, retorna o negativo do interesse total
-        # (pois o SA minimiza, e queremos maximizar o interesse)
-        return -total_interesse
+    def __init__(self, state, cache=None):
+        # state é a lista inicial de índices escolhidos;
+        # cache="auto" memoriza as energias por máscara (ver cache_energia.py)
+        super(AnimeAnnealer, self).__init__(duracoes, interesses, CAPACIDADE_HORAS, state, cache=cache)
 
 # --------------------------------------------------------------------------
 # 3. FUNÇÃO AUXILIAR PARA IMPRIMIR A SOLUÇÃO
@@ -148,4 +100,16 @@ if __name__ == "__main__":
     # Executa o Recozimento Simulado
     best_state, best_energy = annealer.anneal(Tmax=25000, Tmin=2.5, steps=50000)
     
-    print_solution(best_state, "Exercício 3: Otimização de Animes (Max Interesse)")
\ No newline at end of file
+    print_solution(best_state, "Exercício 3: Otimização de Animes (Max Interesse)")
+
+    # --- Pré-redução + semente gulosa ---
+    # A relaxação linear prova que alguns animes (ex.: Naruto, 86 h com
+    # pouco interesse por hora) nunca entram numa solução ótima; eles saem
+    # do problema e o recozimento parte da solução gulosa por interesse/hora.
+    reducao = reduzir_mochila(duracoes, interesses, CAPACIDADE_HORAS)
+    annealer_r = reducao.annealer()
+    state_r, energy_r = annealer_r.anneal(Tmax=25, Tmin=0.5, steps=50000)
+
+    print_solution(reducao.expandir(state_r), "Exercício 3: Com Pré-redução e Semente Gulosa")
+    print(f"Itens fixados: {len(reducao.dentro)} dentro, {len(reducao.fora)} fora; "
+          f"núcleo com {len(reducao.nucleo)} de {len(duracoes)} animes")
@@ -0,0 +1,406 @@
+import json
+from array import array
+
+import numpy as np
+
+from recozimento import UndoAnnealer
+from cache_energia import criar_cache
+from subconjunto import SubsetState
+
+# --------------------------------------------------------------------------
+# 1. CARREGAMENTO DE CATÁLOGOS (colunas NumPy, sem um dict por item)
+# --------------------------------------------------------------------------
+
+def carregar_catalogo(caminho, coluna_peso="peso", coluna_valor="valor"):
+    """
+    Lê um catálogo de itens e devolve (pesos, valores) como arrays float64.
+
+    Formatos aceitos (pela extensão):
+      - .csv   : cabeçalho na primeira linha; lido em blocos pelo NumPy
+      - .jsonl : um objeto JSON por linha; cada linha é descartada após ler
+      - .npy   : matriz (n, 2) [peso, valor] ou array estruturado com campos
+                 coluna_peso/coluna_valor; aberto com memmap (não copia)
+    """
+    if caminho.endswith(".npy"):
+        dados = np.load(caminho, mmap_mode="r")
+        if dados.dtype.names:
+            return dados[coluna_peso], dados[coluna_valor]
+        return dados[:, 0], dados[:, 1]
+
+    if caminho.endswith(".csv"):
+        with open(caminho, encoding="utf-8") as f:
+            cabecalho = [c.strip() for c in f.readline().split(",")]
+        colunas = (cabecalho.index(coluna_peso), cabecalho.index(coluna_valor))
+        pesos, valores = np.loadtxt(caminho, delimiter=",", skiprows=1,
+                                    usecols=colunas, quotechar='"',
+                                    dtype=np.float64, unpack=True, ndmin=2)
+        return pesos, valores
+
+    if caminho.endswith(".jsonl"):
+        pesos = array("d")
+        valores = array("d")
+        with open(caminho, encoding="utf-8") as f:
+            for linha in f:
+                if linha.strip():
+                    item = json.loads(linha)
+                    pesos.append(item[coluna_peso])
+                    valores.append(item[coluna_valor])
+        return np.frombuffer(pesos, dtype=np.float64), np.frombuffer(valores, dtype=np.float64)
+
+    raise ValueError(f"Formato de catálogo não suportado: {caminho}")
+
+# --------------------------------------------------------------------------
+# 2. RECOZIMENTO SIMULADO GENÉRICO PARA A MOCHILA 0/1
+# --------------------------------------------------------------------------
+
+class KnapsackAnnealer(UndoAnnealer):
+    """
+    Recozimento Simulado para escolher um subconjunto de itens.
+    Maximiza a soma de `valores` sem passar de `capacidade` na soma de `pesos`.
+
+    pesos e valores são arrays NumPy (colunas); o estado é um SubsetState
+    com os índices escolhidos.
+
+    Os movimentos preservam a viabilidade: só adicionam itens que cabem na
+    folga atual (busca no índice ordenado por peso) e nunca removem o
+    último item de `obrigatorios` (ao menos um deles deve ficar no estado).
+    Itens de `proibidos` ficam fora do índice e nunca entram.
+
+    cache: None (padrão, sem cache), "auto" (tabela densa para até 20 itens,
+    sem cache para mais; ver cache_energia.py) ou um cache já criado, que
+    pode ser compartilhado entre cadeias do mesmo problema. Com cache, o
+    estado mantém a máscara dos itens escolhidos, que é a chave da consulta.
+    """
+    copy_strategy = 'method'
+
+    # Itens dos quais ao menos um deve estar na solução (vazio = sem restrição)
+    obrigatorios = ()
+
+    # Itens que não podem entrar na solução
+    proibidos = ()
+
+    # Quantas vezes sortear no prefixo de itens que cabem até achar um de fora
+    tentativas = 8
+
+    def __init__(self, pesos, valores, capacidade, state=(), obrigatorios=None,
+                 proibidos=None, ordem_peso=None, cache=None):
+        self.pesos = np.asarray(pesos, dtype=np.float64)
+        self.valores = np.asarray(valores, dtype=np.float64)
+        self.capacidade = capacidade
+        if obrigatorios is not None:
+            self.obrigatorios = tuple(obrigatorios)
+        if proibidos is not None:
+            self.proibidos = tuple(proibidos)
+        self._obrigatorio = frozenset(self.obrigatorios)
+
+        # Índice ordenado por peso: os itens que cabem numa folga f são
+        # ordem_peso[:searchsorted(pesos_ordenados, f)]. Quem roda vários
+        # cenários sobre os mesmos dados pode passar ordem_peso pronto.
+        if ordem_peso is None:
+            ordem_peso = np.argsort(self.pesos, kind="stable")
+        if self.proibidos:
+            ordem_peso = ordem_peso[~np.isin(ordem_peso, self.proibidos)]
+        self.ordem_peso = ordem_peso
+        self.pesos_ordenados = self.pesos[self.ordem_peso]
+
+        if cache == "auto":
+            cache = criar_cache(self.pesos, self.valores, capacidade, self.obrigatorios)
+        self.cache = cache
+
+        super(KnapsackAnnealer, self).__init__(self._novo_estado(state))
+        self._reparar()
+
+    def _novo_estado(self, selecionados):
+        return SubsetState(self.pesos, self.valores, selecionados,
+                           com_mascara=self.cache is not None)
+
+    def chave_calibracao(self):
+        """A calibração depende dos dados: entra um resumo dos arrays."""
+        return (type(self).__qualname__, self.capacidade, self.obrigatorios, self.proibidos, len(self.pesos),
+                hash(self.pesos.tobytes()), hash(self.valores.tobytes()))
+
+    def _obrigatorios_presentes(self):
+        return sum(1 for i in self.obrigatorios if i in self.state)
+
+    def _reparar(self):
+        """
+        Torna o estado inicial viável: tira os proibidos, garante um
+        obrigatório (o mais leve) e tira os itens de pior valor/peso até
+        caber na capacidade.
+        """
+        for i in self.proibidos:
+            if i in self.state:
+                self.state.remover(i)
+
+        if self.obrigatorios and self._obrigatorios_presentes() == 0:
+            self.state.adicionar(min(self.obrigatorios, key=lambda i: self.pesos[i]))
+
+        if self.state.peso_total > self.capacidade:
+            escolhidos = sorted(self.state.selecionados(),
+                                key=lambda i: self.valores[i] / self.pesos[i] if self.pesos[i] > 0 else np.inf)
+            for i in escolhidos:
+                if self.state.peso_total <= self.capacidade:
+                    break
+                if i in self._obrigatorio and self._obrigatorios_presentes() == 1:
+                    continue
+                self.state.remover(i)
+
+    def _fora_que_cabe(self, folga):
+        """Sorteia um item de fora com peso <= folga (None se não achar)."""
+        limite = int(np.searchsorted(self.pesos_ordenados, folga, side="right"))
+        if limite == 0:
+            return None
+        for _ in range(self.tentativas):
+            i = int(self.ordem_peso[self.rng.randrange(limite)])
+            if i not in self.state:
+                return i
+        return None
+
+    def _pode_remover(self, i):
+        """Não deixa remover o último obrigatório presente."""
+        return i not in self._obrigatorio or self._obrigatorios_presentes() > 1
+
+    def move(self):
+        """
+        Gera uma solução "vizinha" viável modificando levemente a atual.
+        Tenta adicionar, remover ou trocar um item aleatoriamente.
+        """
+        # Escolhe uma ação: 0=remover, 1=adicionar, 2=trocar
+        acao = self.rng.randint(0, 2)
+        removido = None
+        adicionado = None
+        folga = self.capacidade - self.state.peso_total
+
+        # Ação 0: Tenta remover um item (se o subconjunto não estiver vazio)
+        if acao == 0 and len(self.state) > 0:
+            removido = self.state.dentro_aleatorio(self.rng)
+            if self._pode_remover(removido):
+                self.state.remover(removido)
+            else:
+                removido = None
+
+        # Ação 1: Tenta adicionar um item que caiba na folga
+        elif acao == 1:
+            adicionado = self._fora_que_cabe(folga)
+            if adicionado is not None:
+                self.state.adicionar(adicionado)
+
+        # Ação 2: Tenta trocar um item (remove um, adiciona outro que caiba)
+        else:
+            removido = self.state.dentro_aleatorio(self.rng)
+            if removido is not None and self._pode_remover(removido):
+                self.state.remover(removido)
+                folga += self.pesos[removido]
+            else:
+                removido = None
+            adicionado = self._fora_que_cabe(folga)
+            if adicionado == removido:
+                adicionado = None
+            if adicionado is not None:
+                self.state.adicionar(adicionado)
+
+        # Guarda o inverso do movimento para o undo()
+        self._desfazer = (removido, adicionado)
+
+    def undo(self):
+        """Desfaz o último move(): tira o que entrou e devolve o que saiu."""
+        removido, adicionado = self._desfazer
+        if adicionado is not None:
+            self.state.remover(adicionado)
+        if removido is not None:
+            self.state.adicionar(removido)
+
+    def snapshot(self):
+        # Cópia compacta (array('i'), 4 bytes por item) dos itens escolhidos
+        return self.state.itens[:self.state.k]
+
+    def restore(self, snapshot):
+        """
+        Leva o estado atual até o snapshot item a item, em O(k) e sem
+        montar outro SubsetState (que custaria O(n) de memória).
+        """
+        alvo = set(snapshot)
+        for i in self.state.selecionados():
+            if i not in alvo:
+                self.state.remover(i)
+        for i in alvo:
+            if i not in self.state:
+                self.state.adicionar(i)
+
+    def estado_exato(self):
+        return self.state.exportar()
+
+    def restaurar_exato(self, dados):
+        self.state = SubsetState.importar(self.pesos, self.valores, dados,
+                                          com_mascara=self.cache is not None)
+
+    def energy(self):
+        """
+        Energia = valor total negativo (o SA minimiza, queremos maximizar).
+        Se estourar a capacidade, a solução é inválida e recebe 1.0
+        (não acontece com os movimentos acima; fica como proteção).
+        Com cache, estados já vistos custam só uma consulta pela máscara.
+        """
+        if self.cache is not None:
+            return self.cache.obter(self.state.mascara, self._energia)
+        return self._energia()
+
+    def _energia(self):
+        if self.state.peso_total > self.capacidade:
+            return 1.0
+        return -float(self.state.valor_total)
+
+# --------------------------------------------------------------------------
+# 3. PRÉ-REDUÇÃO POR LIMITES DA RELAXAÇÃO LINEAR + SEMENTE GULOSA
+# --------------------------------------------------------------------------
+#
+# Antes de recozer um catálogo grande:
+#   1. ordena os itens por valor/peso e monta a solução gulosa, que é viável
+#      e dá um limite inferior LB;
+#   2. para cada item j, calcula o limite de Dantzig (relaxação linear) do
+#      problema com x_j invertido em relação à relaxação. Se esse limite for
+#      menor que LB, toda solução ótima tem x_j igual ao da relaxação: o
+#      item é fixado dentro ou fora;
+#   3. o recozimento roda só no núcleo restante, com a capacidade menos o
+#      peso dos fixados dentro, partindo da semente gulosa.
+
+def _razoes(pesos, valores):
+    """valor/peso, com peso zero indo para o início (razão infinita)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(pesos > 0, valores / np.where(pesos > 0, pesos, 1), np.inf)
+
+def semente_gulosa(pesos, valores, capacidade, obrigatorios=(), proibidos=()):
+    """
+    Solução gulosa por valor/peso: percorre os itens da maior para a menor
+    razão e leva cada um que ainda cabe. Com `obrigatorios`, começa pelo
+    mais leve deles (a mesma regra do _reparar()).
+
+    Retorna a lista de índices escolhidos.
+    """
+    pesos = np.asarray(pesos, dtype=np.float64)
+    valores = np.asarray(valores, dtype=np.float64)
+    permitido = np.ones(len(pesos), dtype=bool)
+    permitido[list(proibidos)] = False
+    permitido &= valores > 0
+
+    escolhidos = []
+    folga = capacidade
+    if obrigatorios:
+        i = min(obrigatorios, key=lambda i: pesos[i])
+        escolhidos.append(int(i))
+        folga -= pesos[i]
+        permitido[i] = False
+
+    for i in np.argsort(-_razoes(pesos, valores), kind="stable"):
+        if permitido[i] and pesos[i] <= folga:
+            escolhidos.append(int(i))
+            folga -= pesos[i]
+    return escolhidos
+
+class ReducaoMochila:
+    """
+    Resultado de reduzir_mochila(): itens fixados e o núcleo a recozer.
+
+    - dentro / fora: índices (originais) fixados na solução ou fora dela
+    - nucleo: índices originais dos itens ainda livres; o item k do
+      problema reduzido é o item nucleo[k] do original
+    - pesos / valores / capacidade / obrigatorios: o problema reduzido
+    - semente: solução gulosa já nos índices do núcleo
+    - limite_inferior / limite_superior: valor guloso e limite de Dantzig
+      do problema original
+    """
+
+    def __init__(self, pesos, valores, capacidade, dentro, fora, nucleo, obrigatorios,
+                 semente, limite_inferior, limite_superior):
+        self.dentro = dentro
+        self.fora = fora
+        self.nucleo = nucleo
+        self.valor_fixo = float(valores[dentro].sum())
+        self.pesos = pesos[nucleo]
+        self.valores = valores[nucleo]
+        self.capacidade = capacidade - float(pesos[dentro].sum())
+
+        local = {int(i): k for k, i in enumerate(nucleo)}
+        obrigatorio_dentro = any(i in obrigatorios for i in dentro.tolist())
+        self.obrigatorios = () if obrigatorio_dentro else tuple(local[i] for i in obrigatorios if i in local)
+        self.semente = [local[i] for i in semente if i in local]
+        self.limite_inferior = limite_inferior
+        self.limite_superior = limite_superior
+
+    def annealer(self, classe=KnapsackAnnealer, **opcoes):
+        """Cria o annealer do núcleo já partindo da semente gulosa."""
+        return classe(self.pesos, self.valores, self.capacidade, self.semente,
+                      obrigatorios=self.obrigatorios, **opcoes)
+
+    def expandir(self, estado):
+        """Converte uma solução do núcleo para os índices originais."""
+        return sorted(self.dentro.tolist() + [int(self.nucleo[k]) for k in estado])
+
+    def valor(self, energia):
+        """Valor total no problema original a partir da energia do núcleo."""
+        return self.valor_fixo - energia
+
+def reduzir_mochila(pesos, valores, capacidade, obrigatorios=(), proibidos=()):
+    """
+    Fixa os itens que a relaxação linear prova estarem dentro ou fora de
+    toda solução ótima e devolve uma ReducaoMochila com o núcleo restante.
+
+    Os limites ignoram `obrigatorios` (a relaxação continua sendo um limite
+    superior), mas o LB vem da semente gulosa, que respeita a restrição;
+    por isso a redução vale também com ela. `proibidos` saem direto.
+    """
+    pesos = np.asarray(pesos, dtype=np.float64)
+    valores = np.asarray(valores, dtype=np.float64)
+    n = len(pesos)
+    obrigatorios = tuple(int(i) for i in obrigatorios)
+
+    semente = semente_gulosa(pesos, valores, capacidade, obrigatorios, proibidos)
+    LB = float(valores[semente].sum())
+
+    # Itens que nunca entram: proibidos, sem valor ou mais pesados que a mochila
+    descartado = np.zeros(n, dtype=bool)
+    descartado[list(proibidos)] = True
+    descartado |= (valores <= 0) | (pesos > capacidade)
+    if obrigatorios:
+        descartado[list(obrigatorios)] &= pesos[list(obrigatorios)] > capacidade
+    livres = np.flatnonzero(~descartado)
+
+    # Relaxação de Dantzig sobre os livres, em ordem de valor/peso.
+    # W[t] / V[t]: somas dos t primeiros; s: item crítico (fracionário).
+    ordem = livres[np.argsort(-_razoes(pesos[livres], valores[livres]), kind="stable")]
+    w = pesos[ordem]
+    v = valores[ordem]
+    r = np.append(_razoes(w, v), 0.0)
+    W = np.concatenate(([0.0], np.cumsum(w)))
+    V = np.concatenate(([0.0], np.cumsum(v)))
+    m = len(ordem)
+
+    def dantzig(folgas):
+        """Limite linear para cada folga, usando os itens em ordem."""
+        t = np.searchsorted(W, folgas, side="right") - 1
+        with np.errstate(invalid="ignore"):
+            fracao = np.where(t < m, (folgas - W[t]) * r[t], 0.0)
+        return V[t] + fracao
+
+    s = int(np.searchsorted(W, capacidade, side="right")) - 1
+    UB = float(dantzig(np.array([capacidade]))[0])
+
+    # Itens antes de s (x=1 na relaxação): limite com o item fora. Tirar o
+    # item p do prefixo equivale a encher até capacidade + w[p] sem ele.
+    antes = np.arange(s)
+    ub_sem = dantzig(capacidade + w[antes]) - v[antes]
+    # Itens depois de s (x=0 na relaxação): limite com o item dentro; o
+    # resto cabe em capacidade - w[p], e o prefixo para antes de s < p.
+    depois = np.arange(s + 1, m)
+    folga = capacidade - w[depois]
+    ub_com = np.where(folga >= 0, v[depois] + dantzig(np.maximum(folga, 0.0)), -np.inf)
+
+    margem = 1e-9 * max(1.0, abs(LB))
+    fixo_dentro = ordem[antes[ub_sem < LB - margem]]
+    fixo_fora = ordem[depois[ub_com < LB - margem]]
+
+    fora = np.union1d(np.flatnonzero(descartado), fixo_fora)
+    dentro = np.sort(fixo_dentro)
+    nucleo = np.setdiff1d(np.arange(n), np.union1d(fora, dentro))
+    return ReducaoMochila(pesos, valores, capacidade, dentro, fora, nucleo, obrigatorios,
+                          semente, LB, UB)
@@ -0,0 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --------------------------------------------------------------------------
+# MULTI-START: VÁRIAS CADEIAS INDEPENDENTES EM PARALELO
+# --------------------------------------------------------------------------
+
+def sementes_das_cadeias(semente, n_cadeias):
+    """
+    Deriva uma semente independente para cada cadeia a partir de uma só.
+    A mesma `semente` sempre gera as mesmas sementes, em qualquer máquina.
+    """
+    filhas = np.random.SeedSequence(semente).spawn(n_cadeias)
+    return [int(s.generate_state(1)[0]) for s in filhas]
+
+def _rodar_cadeia(fabrica, semente, parametros):
+    """Executa uma cadeia em um processo do pool."""
+    annealer = fabrica()
+    annealer.seed(semente)
+    annealer.updates = 0 # sem saída no stderr dentro dos processos
+    return annealer.anneal(**parametros)
+
+def multi_start(fabrica, n_cadeias, semente=0, processos=None, **parametros):
+    """
+    Roda `n_cadeias` recozimentos independentes em um pool de processos.
+
+    fabrica: função (ou classe) sem argumentos que cria um annealer novo,
+             ex.: functools.partial(ShowAnnealer, []). Precisa ser "picklable"
+             (definida no nível de um módulo).
+    semente: semente mestre; cada cadeia recebe a sua (ver sementes_das_cadeias)
+    processos: tamanho do pool (padrão: número de núcleos)
+    parametros: repassados ao anneal() (Tmax, Tmin, steps...)
+
+    Retorna (melhor_estado, melhor_energia, energias), onde `energias` é um
+    array com a energia final de cada cadeia, na ordem das sementes.
+    """
+    sementes = sementes_das_cadeias(semente, n_cadeias)
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        resultados = list(pool.map(_rodar_cadeia,
+                                   [fabrica] * n_cadeias,
+                                   sementes,
+                                   [parametros] * n_cadeias))
+
+    energias = np.array([energia for _, energia in resultados])
+    melhor = int(np.argmin(energias))
+    return resultados[melhor][0], resultados[melhor][1], energias
+
+# --------------------------------------------------------------------------
+# EXEMPLO: 32 reinícios do Exercício 2.A
+# --------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    from functools import partial
+    from exercicio2 import TSPAnnealer, stadiums, print_solution
+
+    rota_inicial = list(range(1, len(stadiums)))
+    melhor_rota, menor_distancia, distancias = multi_start(
+        partial(TSPAnnealer, rota_inicial), n_cadeias=32, semente=42,
+        Tmax=1000000, Tmin=0.1, steps=100000)
+
+    print_solution(melhor_rota, menor_distancia, "Multi-start: Melhor Rota (32 cadeias)")
+    print(f"Distâncias finais: mín {distancias.min():,.0f} km, "
+          f"média {distancias.mean():,.0f} km, máx {distancias.max():,.0f} km")
@@ -0,0 +1,181 @@
+from collections import deque
+
+# --------------------------------------------------------------------------
+# POLIMENTO DA ROTA APÓS O RECOZIMENTO (2-opt + Or-opt, busca local)
+# --------------------------------------------------------------------------
+#
+# Descida determinística de "primeira melhora": aplica o primeiro 2-opt ou
+# Or-opt que encurta a rota, até nenhum movimento melhorar. Usa "don't-look
+# bits": só reexamina cidades cujas arestas mudaram. Como isso não enxerga
+# tudo (ex.: uma cidade que agora caberia numa aresta recém-criada), quando a
+# fila esvazia todas as cidades são reativadas, e a descida só termina após
+# uma passada completa sem melhora.
+#
+# Internamente a rota é um ciclo (a cidade `inicio` pode sair da posição 0);
+# no fim ela é girada para começar em `inicio`.
+
+EPS = 1e-9
+
+def _funcao_distancia(dist):
+    """Aceita uma matriz (dist[i][j]) ou um backend com .distancia(i, j)."""
+    if hasattr(dist, "distancia"):
+        return dist.distancia
+    return lambda i, j: dist[i][j]
+
+def polir_rota(rota, dist, inicio=0, vizinhos=None, max_segmento=3):
+    """
+    Melhora `rota` (ordem de visita sem `inicio`, como o estado do
+    TSPAnnealer) com 2-opt e Or-opt.
+
+    dist: matriz de distâncias ou backend de tsp_grande (com .distancia)
+    vizinhos: candidatos por cidade (ex.: vizinhos_mais_proximos); se None,
+              testa todas as cidades (O(n^2) por cidade, ok para n pequeno)
+    max_segmento: maior trecho movido pelo Or-opt (1 a 3 é o clássico)
+
+    Sem `vizinhos`, o resultado é um ótimo local para 2-opt e Or-opt (com
+    trechos de até max_segmento cidades, nos dois sentidos). Com `vizinhos`,
+    é um ótimo local para os movimentos cuja nova aresta liga uma cidade a
+    um de seus candidatos.
+
+    Retorna (rota_polida, distancia_total).
+    """
+    d = _funcao_distancia(dist)
+    t = [inicio] + [int(c) for c in rota]
+    N = len(t)
+    if N < 4:
+        return t[1:], sum(d(t[k], t[(k + 1) % N]) for k in range(N))
+
+    pos = {c: k for k, c in enumerate(t)}
+    if vizinhos is None:
+        candidatos = lambda c: t
+    else:
+        candidatos = lambda c: vizinhos[c]
+
+    def reindexar(a, b):
+        for k in range(a, b + 1):
+            pos[t[k]] = k
+
+    def dois_opt(i, j):
+        """Troca as arestas (t[i],t[i+1]) e (t[j],t[j+1]) invertendo t[i+1..j]."""
+        if i > j:
+            i, j = j, i
+        t[i + 1:j + 1] = t[i + 1:j + 1][::-1]
+        reindexar(i + 1, j)
+
+    def mover_trecho(inicio_trecho, L, x, invertido):
+        """Tira t[inicio_trecho:inicio_trecho+L] e o insere logo após a cidade x."""
+        if inicio_trecho + L > N:
+            # O trecho dá a volta no fim da lista: gira a lista (raro)
+            t[:] = t[inicio_trecho:] + t[:inicio_trecho]
+            reindexar(0, N - 1)
+            inicio_trecho = 0
+        segmento = t[inicio_trecho:inicio_trecho + L]
+        if invertido:
+            segmento.reverse()
+        px = pos[x]
+        # Só o intervalo entre o trecho e o destino muda de posição
+        if px > inicio_trecho:
+            t[inicio_trecho:px + 1] = t[inicio_trecho + L:px + 1] + segmento
+            reindexar(inicio_trecho, px)
+        else:
+            t[px + 1:inicio_trecho + L] = segmento + t[px + 1:inicio_trecho]
+            reindexar(px + 1, inicio_trecho + L - 1)
+
+    def tentar_2opt(a):
+        """Nova aresta (a, c), nos dois sentidos da rota."""
+        for sentido in (1, -1):
+            pa = pos[a]
+            b = t[(pa + sentido) % N]
+            dab = d(a, b)
+            for c in candidatos(a):
+                c = int(c)
+                if c == a or c == b:
+                    continue
+                dac = d(a, c)
+                if dac >= dab - EPS:
+                    if vizinhos is not None:
+                        break # candidatos em ordem de distância: os próximos são piores
+                    continue
+                pc = pos[c]
+                e = t[(pc + sentido) % N]
+                if e == a:
+                    continue
+                delta = dac + d(b, e) - dab - d(c, e)
+                if delta < -EPS:
+                    if sentido == 1:
+                        dois_opt(pa, pc)
+                    else:
+                        dois_opt((pa - 1) % N, (pc - 1) % N)
+                    ativar(a, b, c, e)
+                    return True
+        return False
+
+    def tentar_or_opt(a):
+        """
+        Move um trecho que tem `a` numa das pontas para junto de um
+        candidato c, com `a` ligado a c (nova aresta (a, c)). Como cada
+        trecho é examinado a partir das duas pontas, isso cobre os dois
+        sentidos de inserção.
+        """
+        for L in range(1, min(max_segmento, N - 3) + 1):
+            for sentido in (1, -1):
+                if L == 1 and sentido == -1:
+                    continue # trecho de uma cidade: o mesmo nos dois sentidos
+                p = pos[a]
+                inicio_trecho = p if sentido == 1 else (p - L + 1) % N
+                segmento = [t[(inicio_trecho + k) % N] for k in range(L)]
+                outra = segmento[-1] if sentido == 1 else segmento[0]
+                anterior = t[(inicio_trecho - 1) % N]
+                seguinte = t[(inicio_trecho + L) % N]
+                # Sem a aresta interna do trecho, a desigualdade triangular não
+                # garante ganho >= 0 (nem custo >= 0): o corte abaixo só vale
+                # no modo rápido, com listas de candidatos
+                ganho = (d(anterior, segmento[0]) + d(segmento[-1], seguinte)
+                         - d(anterior, seguinte))
+                if ganho <= EPS and vizinhos is not None:
+                    continue
+                for c in candidatos(a):
+                    c = int(c)
+                    if c in segmento:
+                        continue
+                    dac = d(a, c)
+                    pc = pos[c]
+                    # Entre c e o sucessor (a logo após c) ou entre o
+                    # antecessor e c (a logo antes de c)
+                    for z, depois_de_c in ((t[(pc + 1) % N], True), (t[(pc - 1) % N], False)):
+                        if z in segmento:
+                            continue
+                        if dac + d(outra, z) - d(c, z) < ganho - EPS:
+                            if depois_de_c:
+                                mover_trecho(inicio_trecho, L, c, sentido == -1)
+                            else:
+                                mover_trecho(inicio_trecho, L, z, sentido == 1 and L > 1)
+                            ativar(anterior, seguinte, c, z, *segmento)
+                            return True
+        return False
+
+    ativos = deque()
+    ativo = set()
+
+    def ativar(*cidades):
+        for c in cidades:
+            if c not in ativo:
+                ativo.add(c)
+                ativos.append(c)
+
+    # Cada rodada começa com todas as cidades ativas; a última não melhora nada
+    melhorias = 1
+    while melhorias:
+        melhorias = 0
+        ativar(*t)
+        while ativos:
+            a = ativos.popleft()
+            ativo.discard(a)
+            if tentar_2opt(a) or tentar_or_opt(a):
+                melhorias += 1
+                ativar(a)
+
+    k = pos[inicio]
+    t = t[k:] + t[:k]
+    distancia = sum(d(t[k], t[(k + 1) % N]) for k in range(N))
+    return t[1:], distancia
@@ -0,0 +1,350 @@
+import math
+import os
+import pickle
+import random
+import time
+from simanneal import Annealer
+
+# Calibrações já feitas, por instância de problema (ver chave_calibracao)
+_calibracoes = {}
+
+# --------------------------------------------------------------------------
+# BASE COMUM DOS RECOZIMENTOS (protocolo move/undo)
+# --------------------------------------------------------------------------
+
+class UndoAnnealer(Annealer):
+    """
+    Annealer que desfaz movimentos em vez de copiar o estado inteiro.
+
+    O simanneal copia o estado (deepcopy) antes de cada passo para poder
+    restaurá-lo quando o movimento é rejeitado. Aqui cada move() guarda
+    o mínimo necessário para se desfazer (ex.: o trecho invertido, o índice
+    adicionado/removido) e undo() aplica esse inverso.
+
+    As subclasses implementam (sorteando sempre com self.rng):
+      - move(): altera self.state, guarda o inverso e (opcional) retorna o delta
+      - undo(): desfaz o último move()
+      - energy(): como no simanneal
+    """
+
+    copy_strategy = 'slice'
+
+    # Sem progresso no stderr por padrão (custa tempo no laço principal);
+    # para acompanhar uma execução, passe uma Telemetria ao anneal().
+    updates = 0
+
+    # Gerador de números aleatórios da cadeia. Por padrão é o módulo random
+    # (global); seed() dá a esta instância um gerador próprio e reprodutível.
+    rng = random
+
+    # Com `paciencia`, a janela de estagnação só começa a contar depois desta
+    # fração do resfriamento (em log de T): na fase quente a cadeia passeia
+    # e a melhor energia quase não muda, sem que isso signifique convergência.
+    fracao_paciencia = 0.5
+
+    def seed(self, semente):
+        """Usa um random.Random(semente) exclusivo desta cadeia."""
+        self.rng = random.Random(semente)
+
+    def undo(self):
+        """Desfaz o último move(). Deve ser implementado pela subclasse."""
+        raise NotImplementedError
+
+    def snapshot(self):
+        """Cópia "rasa" do estado, usada para guardar a melhor solução."""
+        return self.state[:]
+
+    def restore(self, snapshot):
+        """Volta o estado para uma cópia feita por snapshot()."""
+        self.state = snapshot[:]
+
+    def chave_calibracao(self):
+        """
+        Identifica a instância do problema no cache de calibração.
+        Por padrão é a classe (os exercícios usam dados fixos do módulo);
+        annealers com dados próprios devem incluir esses dados na chave.
+        """
+        return (type(self).__module__, type(self).__qualname__)
+
+    def calibrar(self, amostras=500, aceite_inicial=0.98, aceite_final=0.001):
+        """
+        Escolhe Tmax e Tmin a partir dos deltas de energia do próprio problema.
+
+        Faz um passeio aleatório de `amostras` movimentos (todos aceitos) e
+        guarda os deltas positivos. Tmax aceita o delta mediano com
+        probabilidade `aceite_inicial`; Tmin aceita o menor delta com
+        probabilidade `aceite_final`. O estado volta ao original no fim.
+
+        O resultado fica em cache por chave_calibracao(). Retorna (Tmax, Tmin).
+        """
+        chave = self.chave_calibracao()
+        if chave not in _calibracoes:
+            inicial = self.snapshot()
+            E = self.energy()
+            subidas = []
+            for _ in range(amostras):
+                dE = self.move()
+                if dE is None:
+                    dE = self.energy() - E
+                E += dE
+                if dE > 0.0:
+                    subidas.append(dE)
+            self.restore(inicial)
+
+            if not subidas:
+                raise ValueError('Nenhum movimento aumentou a energia; impossível calibrar.')
+            subidas.sort()
+            Tmax = -subidas[len(subidas) // 2] / math.log(aceite_inicial)
+            Tmin = -min(subidas) / math.log(aceite_final)
+            _calibracoes[chave] = (Tmax, max(Tmin, Tmax * 1e-12))
+
+        self.Tmax, self.Tmin = _calibracoes[chave]
+        return self.Tmax, self.Tmin
+
+    def estado_exato(self):
+        """
+        Estado para checkpoint: precisa reproduzir exatamente os próximos
+        movimentos ao ser restaurado. Por padrão é o snapshot().
+        """
+        return self.snapshot()
+
+    def restaurar_exato(self, dados):
+        """Inverso de estado_exato()."""
+        self.restore(dados)
+
+    def salvar_checkpoint(self, caminho, progresso):
+        """
+        Grava um checkpoint compacto (pickle): estado exato, estado do RNG,
+        passo, parâmetros do resfriamento e o melhor até agora. No modo com
+        prazo, o relógio (relogio0) é gravado como tempo já decorrido.
+        A escrita é atômica (arquivo temporário + rename).
+        """
+        relogio0 = progresso.pop("relogio0")
+        if relogio0 is not None:
+            progresso["decorrido"] = time.perf_counter() - relogio0
+        dados = dict(progresso,
+                     state=self.estado_exato(),
+                     rng=self.rng.getstate(),
+                     Tmax=self.Tmax, Tmin=self.Tmin, steps=self.steps,
+                     best_state=self.best_state, best_energy=self.best_energy)
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as fh:
+            pickle.dump(dados, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+
+    def anneal_iter(self, Tmax=None, Tmin=None, steps=None, updates=None, paciencia=None,
+                    telemetria=None, checkpoint=None, checkpoint_a_cada=10000, retomar=None,
+                    prazo=None):
+        """
+        Versão "anytime" do anneal(): gerador que produz
+        (passo, melhor_estado, melhor_energia) a cada nova melhor solução,
+        enquanto a execução continua.
+
+        checkpoint: caminho do arquivo de checkpoint, regravado a cada
+        `checkpoint_a_cada` passos (e ao interromper com Ctrl+C).
+        retomar: caminho de um checkpoint; continua exatamente de onde parou
+        (mesmo estado, mesmo RNG, mesma posição do resfriamento).
+
+        Os demais parâmetros são os do anneal().
+        """
+        if Tmax is not None:
+            self.Tmax = Tmax
+        if Tmin is not None:
+            self.Tmin = Tmin
+        if steps is not None:
+            self.steps = steps
+        if updates is not None:
+            self.updates = updates
+
+        # Contadores acumulados; as taxas de cada janela saem por diferença
+        step, ultima_melhora, accepts, improves = 0, 0, 0, 0
+        passo_frio = None
+        if retomar is not None:
+            with open(retomar, "rb") as fh:
+                dados = pickle.load(fh)
+            self.Tmax, self.Tmin, self.steps = dados["Tmax"], dados["Tmin"], dados["steps"]
+            self.restaurar_exato(dados["state"])
+            if self.rng is random:
+                self.rng = random.Random()
+            self.rng.setstate(dados["rng"])
+            step = dados["step"]
+            ultima_melhora = dados["ultima_melhora"]
+            accepts, improves = dados["accepts"], dados["improves"]
+            passo_frio = dados.get("passo_frio")
+            prazo = dados["prazo"]
+
+        if self.Tmin <= 0.0:
+            raise ValueError('O resfriamento exponencial exige Tmin > 0.')
+        Tfactor = -math.log(self.Tmax / self.Tmin)
+        self.start = time.time()
+        T_paciencia = self.Tmax * math.exp(Tfactor * self.fracao_paciencia)
+
+        # Posição no resfriamento: fracao = fracao_base + (step - passo_base) * fracao_por_passo,
+        # de 0 (Tmax) a 1 (Tmin). Com passos fixos, é só step / steps.
+        if prazo is None:
+            limite = self.steps
+            passo_base, fracao_base, fracao_por_passo = 0, 0.0, 1.0 / self.steps
+            proxima_medicao = math.inf
+            relogio0 = None
+        else:
+            # Com prazo, a fração é o tempo decorrido / prazo. O relógio é lido
+            # a cada ~1 ms de passos (ou 2% do prazo, se menor); entre leituras, a fração avança pela
+            # vazão (passos/s) medida até ali.
+            limite = math.inf
+            decorrido = dados["decorrido"] if retomar is not None else 0.0
+            relogio0 = time.perf_counter() - decorrido
+            medicao0 = (step, decorrido)
+            passo_base, fracao_base, fracao_por_passo = step, decorrido / prazo, 0.0
+            proxima_medicao = step + 16
+
+        # Estado inicial
+        T = self.Tmax * math.exp(Tfactor * min(fracao_base, 1.0))
+        if retomar is not None:
+            E = dados["E"]
+            self.best_state, self.best_energy = dados["best_state"], dados["best_energy"]
+        else:
+            E = self.energy()
+            self.best_state = self.snapshot()
+            self.best_energy = E
+            yield step, self.best_state, self.best_energy
+
+        proxima_atualizacao = math.inf
+        if self.updates > 0 and prazo is None:
+            updateWavelength = self.steps / self.updates
+            self.update(step, T, E, None, None)
+            if self.updates > 1:
+                proxima_atualizacao = (step // updateWavelength + 1) * updateWavelength
+        janela_atualizacao = (step, accepts, improves)
+        proxima_amostra = step + telemetria.intervalo if telemetria is not None else math.inf
+        janela_amostra = (step, accepts, improves)
+        proximo_checkpoint = step + checkpoint_a_cada if checkpoint is not None else math.inf
+
+        try:
+            while step < limite and not self.user_exit:
+                step += 1
+                T = self.Tmax * math.exp(Tfactor * (fracao_base + (step - passo_base) * fracao_por_passo))
+
+                # O movimento pode devolver o delta; senão, recalcula a energia
+                dE = self.move()
+                if dE is None:
+                    dE = self.energy() - E
+
+                if dE > 0.0 and math.exp(-dE / T) < self.rng.random():
+                    # Rejeitado: desfaz só o que o movimento mudou
+                    self.undo()
+                else:
+                    accepts += 1
+                    if dE < 0.0:
+                        improves += 1
+                    E += dE
+                    if E < self.best_energy:
+                        self.best_state = self.snapshot()
+                        self.best_energy = E
+                        ultima_melhora = step
+                        yield step, self.best_state, self.best_energy
+
+                # Parada por estagnação da melhor energia, contada só depois
+                # que o resfriamento passa de T_paciencia (fase fria)
+                if paciencia is not None and T <= T_paciencia:
+                    if passo_frio is None:
+                        passo_frio = step
+                    if step - max(ultima_melhora, passo_frio) >= paciencia:
+                        break
+
+                if step >= proxima_atualizacao:
+                    p, a, i = janela_atualizacao
+                    self.update(step, T, E, (accepts - a) / (step - p), (improves - i) / (step - p))
+                    janela_atualizacao = (step, accepts, improves)
+                    proxima_atualizacao += updateWavelength
+
+                if step >= proxima_amostra:
+                    p, a, i = janela_amostra
+                    telemetria.registrar(step, T, E, self.best_energy,
+                                         (accepts - a) / (step - p), (improves - i) / (step - p))
+                    janela_amostra = (step, accepts, improves)
+                    proxima_amostra += telemetria.intervalo
+
+                if step >= proximo_checkpoint:
+                    self.salvar_checkpoint(checkpoint, dict(
+                        step=step, E=E, ultima_melhora=ultima_melhora, accepts=accepts,
+                        improves=improves, passo_frio=passo_frio, prazo=prazo, relogio0=relogio0))
+                    proximo_checkpoint += checkpoint_a_cada
+
+                if step >= proxima_medicao:
+                    agora = time.perf_counter() - relogio0
+                    vazao = (step - medicao0[0]) / max(agora - medicao0[1], 1e-9)
+                    lote = max(1, int(vazao * min(0.001, prazo / 50)))
+                    # Para se o próximo lote de passos (com um de folga) passaria do prazo
+                    if agora + 2 * lote / vazao >= prazo:
+                        break
+                    passo_base, fracao_base = step, agora / prazo
+                    fracao_por_passo = 1.0 / (vazao * prazo)
+                    proxima_medicao = step + lote
+
+
+            # Interrompido (Ctrl+C): guarda onde parou para poder retomar
+            if self.user_exit and checkpoint is not None:
+                self.salvar_checkpoint(checkpoint, dict(
+                    step=step, E=E, ultima_melhora=ultima_melhora, accepts=accepts,
+                    improves=improves, passo_frio=passo_frio, prazo=prazo, relogio0=relogio0))
+        finally:
+            self.passos_executados = step
+            self.passo_do_melhor = ultima_melhora
+            self.restore(self.best_state)
+            if self.save_state_on_exit:
+                self.save_state()
+
+    def anneal(self, Tmax=None, Tmin=None, steps=None, updates=None, paciencia=None,
+               telemetria=None, checkpoint=None, checkpoint_a_cada=10000, retomar=None,
+               prazo=None):
+        """
+        Recozimento Simulado com resfriamento geométrico de Tmax até Tmin.
+        Os parâmetros são opcionais; se omitidos, usa os atributos da classe.
+
+        paciencia: se informado, para quando a melhor energia passar esse
+        número de passos sem melhorar. A contagem só começa depois que o
+        resfriamento passa de `fracao_paciencia` (metade, em log de T), para
+        não parar ainda na fase quente. Os passos realmente executados ficam
+        em self.passos_executados e o passo da última melhora em
+        self.passo_do_melhor.
+
+        telemetria: uma telemetria.Telemetria que recebe uma amostra a cada
+        `telemetria.intervalo` passos (temperatura, energias e taxas).
+
+        checkpoint/checkpoint_a_cada/retomar: ver anneal_iter().
+
+        prazo: orçamento de tempo em segundos, no lugar de `steps`. O
+        resfriamento vai de Tmax a Tmin ao longo do prazo (ajustado pela
+        vazão medida durante a execução) e termina antes dele; os passos
+        alcançados ficam em self.passos_executados.
+
+        Retorna (melhor_estado, melhor_energia).
+        """
+        for _ in self.anneal_iter(Tmax, Tmin, steps, updates, paciencia,
+                                  telemetria, checkpoint, checkpoint_a_cada, retomar, prazo):
+            pass
+        return self.best_state, self.best_energy
+
+    def metropolis(self, T, steps, E):
+        """
+        Executa `steps` passos a temperatura FIXA T, partindo da energia E
+        do estado atual. Atualiza best_state/best_energy e retorna a energia
+        final. Usado pelo parallel tempering (cada réplica tem seu T).
+        """
+        if self.best_energy is None or E < self.best_energy:
+            self.best_state = self.snapshot()
+            self.best_energy = E
+
+        for _ in range(steps):
+            dE = self.move()
+            if dE is None:
+                dE = self.energy() - E
+
+            if dE > 0.0 and math.exp(-dE / T) < self.rng.random():
+                self.undo()
+            else:
+                E += dE
+                if E < self.best_energy:
+                    self.best_state = self.snapshot()
+                    self.best_energy = E
+        return E
@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# --------------------------------------------------------------------------
+# SERVIÇO LOCAL DE OTIMIZAÇÃO (asyncio + HTTP + pool de processos aquecido)
+# --------------------------------------------------------------------------
+#
+# Em vez de rodar exercicio1.py/2.py/3.py como scripts (pagando a partida do
+# interpretador e o import do simanneal a cada chamada), um processo fica no
+# ar e recebe tarefas em JSON:
+#
+#   POST /resolver
+#   {"tipo": "mochila", "pesos": [...], "valores": [...], "capacidade": 3000,
+#    "obrigatorios": [0, 1], "proibidos": [], "Tmax": 25, "Tmin": 0.5,
+#    "steps": 50000, "semente": 0}
+#
+#   {"tipo": "tsp", "dist": [[...], ...], "inicio": 0, "Tmax": 5000, "Tmin": 1,
+#    "steps": 100000, "polir": true, "semente": 0}
+#
+# Em qualquer tarefa, "prazo" (segundos) pode substituir "steps". A matriz
+# "dist" deve ser simétrica (o 2-opt do TSPAnnealer supõe isso); tarefas
+# malformadas são recusadas com 400 antes de ir ao pool.
+#
+# Tarefas pequenas (steps <= LIMITE_PEQUENA) que chegam juntas são agrupadas
+# em lotes; cada lote é repartido entre os processos do pool (um envio por
+# processo) e as tarefas grandes vão sozinhas. A resposta traz o resultado e
+# os tempos: fila (da chegada até a tarefa começar a ser resolvida, incluindo
+# a espera dentro do lote), solução e total.
+
+LIMITE_PEQUENA = 20000   # passos
+JANELA_LOTE = 0.005      # segundos esperando mais tarefas para o lote
+MAX_LOTE = 32
+
+# ---- Lado dos processos do pool ----
+
+def _aquecer():
+    """Inicializador do pool: importa tudo e roda uma solução mínima."""
+    resolver_tarefa({"tipo": "mochila", "pesos": [1.0], "valores": [1.0],
+                     "capacidade": 1.0, "steps": 10})
+
+def _inteiro(valor):
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+def _numero(valor):
+    return (_inteiro(valor) or isinstance(valor, float)) and math.isfinite(valor)
+
+def _indices(tarefa, campo, n):
+    """Mensagem de erro se tarefa[campo] não for uma lista de índices em 0..n-1."""
+    valor = tarefa.get(campo, [])
+    if not (isinstance(valor, list) and all(_inteiro(i) and 0 <= i < n for i in valor)):
+        return f"{campo} deve ser uma lista de índices entre 0 e {n - 1}"
+    return None
+
+def _validar_mochila(tarefa):
+    pesos, valores = tarefa.get("pesos"), tarefa.get("valores")
+    for campo, coluna in (("pesos", pesos), ("valores", valores)):
+        if not (isinstance(coluna, list) and coluna and all(_numero(x) for x in coluna)):
+            return f"{campo} deve ser uma lista não vazia de números"
+    if len(pesos) != len(valores):
+        return "pesos e valores devem ter o mesmo tamanho"
+    if any(p < 0 for p in pesos):
+        return "pesos não podem ser negativos"
+    if not _numero(tarefa.get("capacidade")):
+        return "capacidade deve ser um número"
+    return _indices(tarefa, "obrigatorios", len(pesos)) or _indices(tarefa, "proibidos", len(pesos))
+
+def _validar_tsp(tarefa):
+    dist = tarefa.get("dist")
+    n = len(dist) if isinstance(dist, list) else 0
+    if n < 2 or not all(isinstance(linha, list) and len(linha) == n
+                        and all(_numero(x) for x in linha) for linha in dist):
+        return "dist deve ser uma matriz quadrada de números com ao menos 2 cidades"
+    # O delta O(1) do 2-opt (TSPAnnealer.move) supõe d[i][j] == d[j][i]
+    for i in range(n):
+        for j in range(i + 1, n):
+            if abs(dist[i][j] - dist[j][i]) > 1e-9 * max(1.0, abs(dist[i][j])):
+                return f"dist deve ser simétrica (dist[{i}][{j}] != dist[{j}][{i}])"
+    inicio = tarefa.get("inicio", 0)
+    if not (_inteiro(inicio) and 0 <= inicio < n):
+        return f"inicio deve ser um índice entre 0 e {n - 1}"
+    return None
+
+def validar_tarefa(tarefa):
+    """Devolve a mensagem de erro de uma tarefa malformada (None se ok)."""
+    if not isinstance(tarefa, dict):
+        return "a tarefa deve ser um objeto JSON"
+    if tarefa.get("tipo") not in ("mochila", "tsp"):
+        return f"tipo de tarefa desconhecido: {tarefa.get('tipo')!r}"
+    if "steps" in tarefa and not (_inteiro(tarefa["steps"]) and tarefa["steps"] > 0):
+        return "steps deve ser um inteiro positivo"
+    for campo in ("prazo", "Tmax", "Tmin"):
+        valor = tarefa.get(campo, 1)
+        if not ((_inteiro(valor) or isinstance(valor, float)) and valor > 0):
+            return f"{campo} deve ser um número positivo"
+    if not _inteiro(tarefa.get("semente", 0)):
+        return "semente deve ser um inteiro"
+    if tarefa["tipo"] == "mochila":
+        return _validar_mochila(tarefa)
+    return _validar_tsp(tarefa)
+
+def resolver_tarefa(tarefa):
+    """Resolve uma tarefa (dict) e devolve um dict serializável em JSON."""
+    from mochila import KnapsackAnnealer
+    from exercicio2 import TSPAnnealer
+    from polimento import polir_rota
+
+    # Relógio de parede: comparável com a chegada, marcada no servidor
+    inicio_solucao = time.time()
+    inicio = time.perf_counter()
+    tipo = tarefa.get("tipo")
+    parametros = {"Tmax": tarefa.get("Tmax", 25.0), "Tmin": tarefa.get("Tmin", 0.5)}
+    if "prazo" in tarefa:
+        parametros["prazo"] = tarefa["prazo"]
+    else:
+        parametros["steps"] = tarefa.get("steps", 50000)
+
+    if tipo == "mochila":
+        annealer = KnapsackAnnealer(tarefa["pesos"], tarefa["valores"], tarefa["capacidade"],
+                                    obrigatorios=tarefa.get("obrigatorios", ()),
+                                    proibidos=tarefa.get("proibidos", ()))
+        annealer.seed(tarefa.get("semente", 0))
+        estado, energia = annealer.anneal(**parametros)
+        resultado = {"estado": sorted(int(i) for i in estado), "valor": -energia}
+
+    elif tipo == "tsp":
+        dist = tarefa["dist"]
+        inicio_rota = tarefa.get("inicio", 0)
+        rota = [c for c in range(len(dist)) if c != inicio_rota]
+        annealer = TSPAnnealer(rota, dist, inicio_rota)
+        annealer.seed(tarefa.get("semente", 0))
+        estado, energia = annealer.anneal(**parametros)
+        if tarefa.get("polir", True):
+            estado, _ = polir_rota(estado, dist, inicio_rota)
+        # A distância sai da rota devolvida, não da energia acumulada pelos deltas
+        ciclo = [inicio_rota] + [int(c) for c in estado] + [inicio_rota]
+        distancia = sum(dist[a][b] for a, b in zip(ciclo, ciclo[1:]))
+        resultado = {"rota": ciclo[1:-1], "distancia": distancia}
+
+    else:
+        raise ValueError(f"tipo de tarefa desconhecido: {tipo!r}")
+
+    resultado["passos"] = annealer.passos_executados
+    resultado["inicio_solucao"] = inicio_solucao
+    resultado["tempo_solucao_s"] = time.perf_counter() - inicio
+    resultado["pid"] = os.getpid()
+    return resultado
+
+def resolver_lote(tarefas):
+    """Resolve um lote no mesmo processo; erros viram {"erro": ...}."""
+    resultados = []
+    for tarefa in tarefas:
+        try:
+            resultados.append(resolver_tarefa(tarefa))
+        except Exception as erro:
+            resultados.append({"erro": f"{type(erro).__name__}: {erro}",
+                               "inicio_solucao": time.time()})
+    return resultados
+
+# ---- Lado do servidor (asyncio) ----
+
+class ServicoOtimizacao:
+    """Servidor HTTP mínimo sobre asyncio com agrupamento de tarefas em lotes."""
+
+    def __init__(self, processos=None):
+        self.processos = processos or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.processos, initializer=_aquecer)
+        self.fila = asyncio.Queue()
+
+    async def resolver(self, tarefa):
+        """Valida e enfileira a tarefa; espera o resultado (com os tempos)."""
+        chegada = time.time()
+        erro = validar_tarefa(tarefa)
+        if erro is not None:
+            return {"erro": erro}
+        futuro = asyncio.get_running_loop().create_future()
+        pequena = "prazo" not in tarefa and tarefa.get("steps", 50000) <= LIMITE_PEQUENA
+        if pequena:
+            await self.fila.put((tarefa, futuro, chegada))
+        else:
+            asyncio.ensure_future(self._despachar([(tarefa, futuro, chegada)]))
+        resultado = await futuro
+        resultado["tempo_total_s"] = time.time() - chegada
+        return resultado
+
+    async def _agrupar(self):
+        """Junta tarefas pequenas por até JANELA_LOTE segundos (ou MAX_LOTE)."""
+        while True:
+            lote = [await self.fila.get()]
+            limite = time.perf_counter() + JANELA_LOTE
+            while len(lote) < MAX_LOTE:
+                restante = limite - time.perf_counter()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self.fila.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            # Um pedaço do lote por processo: nenhum processo fica ocioso
+            # enquanto outro resolve o lote inteiro em série
+            partes = min(len(lote), self.processos)
+            for k in range(partes):
+                asyncio.ensure_future(self._despachar(lote[k::partes]))
+
+    async def _despachar(self, lote):
+        loop = asyncio.get_running_loop()
+        try:
+            resultados = await loop.run_in_executor(self.pool, resolver_lote,
+                                                    [tarefa for tarefa, _, _ in lote])
+        except Exception as erro:
+            resultados = [{"erro": f"{type(erro).__name__}: {erro}",
+                           "inicio_solucao": time.time()}] * len(lote)
+        for (_, futuro, chegada), resultado in zip(lote, resultados):
+            resultado = dict(resultado, tamanho_lote=len(lote))
+            resultado["tempo_fila_s"] = resultado.pop("inicio_solucao") - chegada
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    async def _atender(self, leitor, escritor):
+        """Uma conexão HTTP: lê uma requisição, responde e fecha."""
+        try:
+            linha = (await leitor.readline()).decode("latin-1").split()
+            cabecalhos = {}
+            while True:
+                l = await leitor.readline()
+                if l in (b"\r\n", b"\n", b""):
+                    break
+                chave, _, valor = l.decode("latin-1").partition(":")
+                cabecalhos[chave.strip().lower()] = valor.strip()
+            try:
+                tamanho = int(cabecalhos.get("content-length", 0))
+            except ValueError:
+                tamanho = -1
+
+            if tamanho < 0:
+                status, resposta = 400, {"erro": "Content-Length inválido"}
+            elif len(linha) >= 2 and linha[0] == "GET" and linha[1] == "/saude":
+                status, resposta = 200, {"ok": True}
+            elif len(linha) >= 2 and linha[0] == "POST" and linha[1] == "/resolver":
+                try:
+                    tarefa = json.loads(await leitor.readexactly(tamanho))
+                except asyncio.IncompleteReadError:
+                    status, resposta = 400, {"erro": "corpo menor que o Content-Length"}
+                except ValueError as erro:
+                    status, resposta = 400, {"erro": f"JSON inválido: {erro}"}
+                else:
+                    resposta = await self.resolver(tarefa)
+                    status = 400 if "erro" in resposta else 200
+            else:
+                status, resposta = 404, {"erro": "use POST /resolver ou GET /saude"}
+
+            dados = json.dumps(resposta, ensure_ascii=False).encode("utf-8")
+            motivo = {200: "OK", 400: "Bad Request", 404: "Not Found"}[status]
+            escritor.write(f"HTTP/1.1 {status} {motivo}\r\n"
+                           f"Content-Type: application/json; charset=utf-8\r\n"
+                           f"Content-Length: {len(dados)}\r\n"
+                           f"Connection: close\r\n\r\n".encode("latin-1") + dados)
+            await escritor.drain()
+        finally:
+            escritor.close()
+
+    async def servir(self, host="127.0.0.1", porta=8765):
+        # Aquece todos os processos antes de aceitar conexões
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, resolver_lote, [])
+                               for _ in range(self.processos)])
+        asyncio.ensure_future(self._agrupar())
+        servidor = await asyncio.start_server(self._atender, host, porta)
+        print(f"Serviço de otimização em http://{host}:{porta} "
+              f"({self.processos} processos)")
+        async with servidor:
+            await servidor.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço local de otimização (SA)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--processos", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(ServicoOtimizacao(args.processos).servir(args.host, args.porta))
@@ -0,0 +1,149 @@
+import random
+from array import array
+
+import numpy as np
+
+# --------------------------------------------------------------------------
+# ESTADO DE SUBCONJUNTO (problemas de mochila)
+# --------------------------------------------------------------------------
+
+# Chaves por item para a máscara: até 64 itens, o bit i (máscara exata);
+# acima disso um inteiro de bits custaria O(n) por XOR, então cada item
+# recebe uma chave aleatória de 63 bits (hash de Zobrist). A semente fixa
+# faz estados do mesmo tamanho usarem as mesmas chaves (cache compartilhado).
+_chaves_mascara = {}
+
+def chaves_mascara(n):
+    if n not in _chaves_mascara:
+        if n <= 64:
+            _chaves_mascara[n] = [1 << i for i in range(n)]
+        else:
+            rng = np.random.default_rng(n)
+            _chaves_mascara[n] = rng.integers(0, 1 << 63, size=n, dtype=np.int64).tolist()
+    return _chaves_mascara[n]
+
+def _inteiros(valores):
+    """array('i') (4 bytes por item) com o conteúdo de um array NumPy."""
+    return array("i", np.ascontiguousarray(valores, dtype=np.intc).tobytes())
+
+class SubsetState:
+    """
+    Subconjunto de itens com adicionar/remover/sortear em O(1).
+
+    - dentro: bytearray com 1 para os itens escolhidos (teste de pertinência)
+    - itens: permutação de 0..n-1; os k primeiros estão no subconjunto e
+      o resto está fora. pos[i] é a posição do item i em itens. Ambos são
+      array('i'): ~9 bytes por item no total, contra ~100 com listas.
+    - peso_total / valor_total: somas acumuladas dos itens escolhidos.
+    - mascara (opcional, com_mascara=True): XOR das chaves_mascara() dos
+      itens escolhidos (o bit i para até 64 itens); chave do cache de energia.
+
+    Entrar ou sair do subconjunto é só trocar o item de lado na fronteira k.
+    """
+
+    def __init__(self, pesos, valores, selecionados=(), com_mascara=False):
+        self.pesos = pesos
+        self.valores = valores
+        n = len(pesos)
+        self.dentro = bytearray(n)
+        self.itens = _inteiros(np.arange(n))
+        self.pos = self.itens[:]
+        self.k = 0
+        self.peso_total = 0
+        self.valor_total = 0
+        self.mascara = 0 if com_mascara else None
+        self.chaves = chaves_mascara(n) if com_mascara else None
+        for i in selecionados:
+            if not self.dentro[i]:
+                self.adicionar(i)
+
+    def __len__(self):
+        return self.k
+
+    def __iter__(self):
+        return iter(self.itens[:self.k])
+
+    def __contains__(self, i):
+        return self.dentro[i] == 1
+
+    def _trocar_posicoes(self, p, q):
+        itens, pos = self.itens, self.pos
+        i, j = itens[p], itens[q]
+        itens[p], itens[q] = j, i
+        pos[i], pos[j] = q, p
+
+    def adicionar(self, i):
+        """Coloca o item i (que está fora) no subconjunto."""
+        self._trocar_posicoes(self.pos[i], self.k)
+        self.k += 1
+        self.dentro[i] = 1
+        self.peso_total += self.pesos[i]
+        self.valor_total += self.valores[i]
+        if self.mascara is not None:
+            self.mascara ^= self.chaves[i]
+
+    def remover(self, i):
+        """Tira o item i (que está dentro) do subconjunto."""
+        self.k -= 1
+        self._trocar_posicoes(self.pos[i], self.k)
+        self.dentro[i] = 0
+        self.peso_total -= self.pesos[i]
+        self.valor_total -= self.valores[i]
+        if self.mascara is not None:
+            self.mascara ^= self.chaves[i]
+
+    def dentro_aleatorio(self, rng=random):
+        """Sorteia um item do subconjunto (None se estiver vazio)."""
+        if self.k == 0:
+            return None
+        return self.itens[rng.randrange(self.k)]
+
+    def fora_aleatorio(self, rng=random):
+        """Sorteia um item fora do subconjunto (None se todos estiverem dentro)."""
+        n = len(self.itens)
+        if self.k == n:
+            return None
+        return self.itens[self.k + rng.randrange(n - self.k)]
+
+    def selecionados(self):
+        """Lista simples com os índices escolhidos."""
+        return self.itens[:self.k].tolist()
+
+    def exportar(self):
+        """Representação compacta e exata (para checkpoints)."""
+        return (np.frombuffer(self.itens, dtype=np.intc).astype(np.int64),
+                self.k, self.peso_total, self.valor_total)
+
+    @classmethod
+    def importar(cls, pesos, valores, dados, com_mascara=False):
+        """Reconstrói exatamente um estado gerado por exportar()."""
+        itens, k, peso_total, valor_total = dados
+        novo = cls(pesos, valores, com_mascara=com_mascara)
+        pos = np.empty(len(itens), dtype=np.intc)
+        pos[itens] = np.arange(len(itens))
+        dentro = np.zeros(len(itens), dtype=np.uint8)
+        dentro[itens[:k]] = 1
+        novo.itens = _inteiros(itens)
+        novo.pos = _inteiros(pos)
+        novo.dentro = bytearray(dentro.tobytes())
+        if com_mascara:
+            for i in itens[:k].tolist():
+                novo.mascara ^= novo.chaves[i]
+        novo.k = k
+        novo.peso_total = peso_total
+        novo.valor_total = valor_total
+        return novo
+
+    def copy(self):
+        novo = SubsetState.__new__(SubsetState)
+        novo.pesos = self.pesos
+        novo.valores = self.valores
+        novo.dentro = bytearray(self.dentro)
+        novo.itens = self.itens[:]
+        novo.pos = self.pos[:]
+        novo.k = self.k
+        novo.peso_total = self.peso_total
+        novo.valor_total = self.valor_total
+        novo.mascara = self.mascara
+        novo.chaves = self.chaves
+        return novo
@@ -0,0 +1,57 @@
+import numpy as np
+
+# --------------------------------------------------------------------------
+# TELEMETRIA DO RECOZIMENTO (buffer circular pré-alocado)
+# --------------------------------------------------------------------------
+
+CAMPOS = ("passo", "temperatura", "energia", "melhor_energia", "aceitacao", "melhora")
+
+class Telemetria:
+    """
+    Guarda amostras de uma execução do anneal() em arrays pré-alocados.
+
+    A cada `intervalo` passos o anneal() registra: passo, temperatura,
+    energia atual, melhor energia e as taxas de aceitação e de melhora da
+    janela desde a amostra anterior. Quando as `capacidade` posições enchem,
+    as amostras mais antigas são sobrescritas (buffer circular).
+
+    Uso:
+        t = Telemetria(capacidade=1000, intervalo=100)
+        annealer.anneal(Tmax=..., Tmin=..., steps=..., telemetria=t)
+        t.para_csv("execucao.csv")
+    """
+
+    def __init__(self, capacidade=10000, intervalo=100):
+        self.capacidade = capacidade
+        self.intervalo = intervalo
+        self._dados = np.zeros((capacidade, len(CAMPOS)), dtype=np.float64)
+        self.total = 0 # amostras registradas desde o início
+
+    def __len__(self):
+        return min(self.total, self.capacidade)
+
+    def registrar(self, passo, T, E, melhor, aceitacao, melhora):
+        linha = self._dados[self.total % self.capacidade]
+        linha[0] = passo
+        linha[1] = T
+        linha[2] = E
+        linha[3] = melhor
+        linha[4] = aceitacao
+        linha[5] = melhora
+        self.total += 1
+
+    def como_array(self):
+        """Matriz (amostras, campos) em ordem cronológica (cópia)."""
+        if self.total <= self.capacidade:
+            return self._dados[:self.total].copy()
+        inicio = self.total % self.capacidade
+        return np.concatenate((self._dados[inicio:], self._dados[:inicio]))
+
+    def como_arrays(self):
+        """Dicionário campo -> array 1D, em ordem cronológica."""
+        dados = self.como_array()
+        return {campo: dados[:, k] for k, campo in enumerate(CAMPOS)}
+
+    def para_csv(self, caminho):
+        np.savetxt(caminho, self.como_array(), delimiter=",",
+                   header=",".join(CAMPOS), comments="", fmt="%.10g")
@@ -0,0 +1,148 @@
+import math
+import random
+from multiprocessing import Pipe, Process
+
+import numpy as np
+
+from multistart import sementes_das_cadeias
+
+# --------------------------------------------------------------------------
+# PARALLEL TEMPERING (TROCA DE RÉPLICAS)
+# --------------------------------------------------------------------------
+#
+# K réplicas do mesmo problema rodam, cada uma em seu processo, a uma
+# temperatura fixa de uma "escada" geométrica entre Tmax e Tmin. A cada
+# `troca_a_cada` passos, réplicas vizinhas na escada tentam trocar de
+# temperatura (critério de Metropolis sobre as energias). Trocar as
+# temperaturas equivale a trocar os estados, sem enviar o estado pelo pipe.
+
+def _replica(conexao, fabrica, semente):
+    """
+    Laço de um processo de réplica: recebe comandos e responde com
+    ("ok", valor). Se algo falhar, responde ("erro", exceção) e termina,
+    para o processo principal repassar o erro original.
+    """
+    try:
+        annealer = fabrica()
+        annealer.seed(semente)
+        E = annealer.energy()
+        while True:
+            comando = conexao.recv()
+            if comando[0] == "rodar":
+                _, T, passos = comando
+                E = annealer.metropolis(T, passos, E)
+                conexao.send(("ok", E))
+            elif comando[0] == "melhor":
+                conexao.send(("ok", (annealer.best_state, annealer.best_energy)))
+            else: # "fim"
+                return
+    except (EOFError, OSError):
+        return # o processo principal já fechou o pipe
+    except Exception as erro:
+        try:
+            conexao.send(("erro", erro))
+        except Exception:
+            conexao.send(("erro", RuntimeError(repr(erro))))
+    finally:
+        conexao.close()
+
+def _enviar(conexao, comando):
+    """Envia um comando; se a réplica já morreu, relança o erro que ela deixou no pipe."""
+    try:
+        conexao.send(comando)
+    except OSError:
+        if conexao.poll():
+            _receber(conexao)
+        raise
+
+def _receber(conexao):
+    """Resposta de uma réplica; relança a exceção se ela falhou."""
+    situacao, valor = conexao.recv()
+    if situacao == "erro":
+        raise valor
+    return valor
+
+def escada_de_temperaturas(Tmax, Tmin, replicas):
+    """Temperaturas em progressão geométrica, da mais quente à mais fria."""
+    if replicas == 1:
+        return [Tmin]
+    return list(np.geomspace(Tmax, Tmin, replicas))
+
+def parallel_tempering(fabrica, Tmax, Tmin, steps, replicas=8, troca_a_cada=100, semente=0):
+    """
+    Alternativa ao anneal(): troca de réplicas em uma escada fixa de temperaturas.
+
+    fabrica: função (ou classe) sem argumentos que cria um annealer novo,
+             ex.: functools.partial(AnimeAnnealer, [])
+    steps: total de passos somando todas as réplicas (comparável ao anneal)
+    replicas: número de réplicas/processos (K)
+    troca_a_cada: passos de cada réplica entre tentativas de troca
+
+    Retorna (melhor_estado, melhor_energia), como o anneal().
+    """
+    temperaturas = escada_de_temperaturas(Tmax, Tmin, replicas)
+    sementes = sementes_das_cadeias(semente, replicas + 1)
+    rng = random.Random(sementes[-1]) # decide as trocas
+
+    conexoes = []
+    processos = []
+    for k in range(replicas):
+        nossa, deles = Pipe()
+        p = Process(target=_replica, args=(deles, fabrica, sementes[k]), daemon=True)
+        p.start()
+        # Só o filho fica com a outra ponta: se ele morrer, recv() aqui dá EOFError
+        deles.close()
+        conexoes.append(nossa)
+        processos.append(p)
+
+    # replica_em[t] = índice da réplica que está na temperatura t
+    replica_em = list(range(replicas))
+    rodadas = max(1, steps // (replicas * troca_a_cada))
+    try:
+        for rodada in range(rodadas):
+            for t, k in enumerate(replica_em):
+                _enviar(conexoes[k], ("rodar", temperaturas[t], troca_a_cada))
+            energias = [None] * replicas
+            for t, k in enumerate(replica_em):
+                energias[t] = _receber(conexoes[k])
+
+            # Alterna pares (0,1),(2,3)... e (1,2),(3,4)... entre as rodadas
+            for t in range(rodada % 2, replicas - 1, 2):
+                delta = (1.0 / temperaturas[t] - 1.0 / temperaturas[t + 1]) * (energias[t] - energias[t + 1])
+                if delta >= 0.0 or math.exp(delta) > rng.random():
+                    replica_em[t], replica_em[t + 1] = replica_em[t + 1], replica_em[t]
+                    energias[t], energias[t + 1] = energias[t + 1], energias[t]
+
+        melhores = []
+        for c in conexoes:
+            _enviar(c, ("melhor",))
+            melhores.append(_receber(c))
+    finally:
+        # Encerramento sem mascarar o erro que estiver subindo (pipe já morto)
+        for c in conexoes:
+            try:
+                c.send(("fim",))
+            except OSError:
+                pass
+            c.close()
+        for p in processos:
+            p.join(timeout=1.0)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+
+    return min(melhores, key=lambda m: m[1])
+
+# --------------------------------------------------------------------------
+# EXEMPLO: Exercício 1.b com o mesmo orçamento de 1000 passos
+# --------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    from functools import partial
+    from exercicio1 import ShowAnnealer, print_solution
+
+    best_state, best_energy = parallel_tempering(
+        partial(ShowAnnealer, []), Tmax=25, Tmin=0.5, steps=1000,
+        replicas=4, troca_a_cada=25, semente=42)
+
+    print_solution(best_state, "Parallel Tempering: Exercício 1.b (1000 passos no total)")
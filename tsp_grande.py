@@ -0,0 +1,260 @@
+import math
+
+import numpy as np
+
+from recozimento import UndoAnnealer
+
+# --------------------------------------------------------------------------
+# 1. LEITURA DE COORDENADAS (TSPLIB ou CSV)
+# --------------------------------------------------------------------------
+
+def carregar_coordenadas(caminho):
+    """
+    Lê as coordenadas das cidades. Retorna (coords, tipo), onde coords é um
+    array float64 (n, 2) e tipo é o EDGE_WEIGHT_TYPE (EUC_2D, CEIL_2D, GEO).
+
+    - .tsp (TSPLIB): lê o cabeçalho e a NODE_COORD_SECTION ("id x y")
+    - .csv: cabeçalho com colunas x,y; o tipo é EUC_2D sem arredondar ("EXATA")
+    """
+    if caminho.endswith(".csv"):
+        with open(caminho, encoding="utf-8") as f:
+            cabecalho = [c.strip() for c in f.readline().split(",")]
+        colunas = (cabecalho.index("x"), cabecalho.index("y"))
+        coords = np.loadtxt(caminho, delimiter=",", skiprows=1, usecols=colunas,
+                            dtype=np.float64, ndmin=2)
+        return coords, "EXATA"
+
+    cabecalho = {}
+    linhas_cabecalho = 0
+    with open(caminho, encoding="utf-8") as f:
+        for linha in f:
+            linhas_cabecalho += 1
+            if linha.strip().startswith("NODE_COORD_SECTION"):
+                break
+            if ":" in linha:
+                chave, valor = linha.split(":", 1)
+                cabecalho[chave.strip()] = valor.strip()
+
+    tipo = cabecalho.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+    if tipo not in ("EUC_2D", "CEIL_2D", "GEO"):
+        raise ValueError(f"EDGE_WEIGHT_TYPE não suportado: {tipo}")
+    n = int(cabecalho["DIMENSION"])
+    coords = np.loadtxt(caminho, skiprows=linhas_cabecalho, max_rows=n,
+                        usecols=(1, 2), dtype=np.float64, ndmin=2)
+    return coords, tipo
+
+# --------------------------------------------------------------------------
+# 2. DISTÂNCIAS (calculadas na hora ou lidas de uma matriz em disco)
+# --------------------------------------------------------------------------
+
+def _geo_radianos(valor):
+    """Conversão "graus.minutos" -> radianos da TSPLIB (tipo GEO)."""
+    graus = np.trunc(valor)
+    return math.pi * (graus + 5.0 * (valor - graus) / 3.0) / 180.0
+
+class DistanciasCoordenadas:
+    """
+    Distâncias calculadas sob demanda a partir das coordenadas: memória O(n).
+    Segue as regras da TSPLIB para EUC_2D (arredonda), CEIL_2D e GEO.
+    """
+
+    def __init__(self, coords, tipo="EXATA"):
+        self.coords = np.asarray(coords, dtype=np.float64)
+        self.tipo = tipo
+        if tipo == "GEO":
+            lat = _geo_radianos(self.coords[:, 0])
+            lon = _geo_radianos(self.coords[:, 1])
+            self._a, self._b = lat.tolist(), lon.tolist()
+        else:
+            self._a, self._b = self.coords[:, 0].tolist(), self.coords[:, 1].tolist()
+
+    def __len__(self):
+        return len(self._a)
+
+    def chave(self):
+        return (self.tipo, hash(self.coords.tobytes()))
+
+    def distancia(self, i, j):
+        if self.tipo == "GEO":
+            if i == j:
+                return 0
+            q1 = math.cos(self._b[i] - self._b[j])
+            q2 = math.cos(self._a[i] - self._a[j])
+            q3 = math.cos(self._a[i] + self._a[j])
+            return int(6378.388 * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+        d = math.hypot(self._a[i] - self._a[j], self._b[i] - self._b[j])
+        if self.tipo == "EUC_2D":
+            return int(d + 0.5)
+        if self.tipo == "CEIL_2D":
+            return math.ceil(d)
+        return d
+
+def gravar_matriz(distancias, caminho, bloco=1024):
+    """
+    Grava a matriz n x n em float32 num arquivo .npy (memmap), bloco de
+    linhas por bloco, sem montar a matriz na memória. Usa as mesmas regras
+    de DistanciasCoordenadas.distancia (EXATA, EUC_2D, CEIL_2D e GEO).
+    """
+    coords = distancias.coords
+    n = len(coords)
+    if distancias.tipo == "GEO":
+        lat = _geo_radianos(coords[:, 0])
+        lon = _geo_radianos(coords[:, 1])
+    matriz = np.lib.format.open_memmap(caminho, mode="w+", dtype=np.float32, shape=(n, n))
+    for inicio in range(0, n, bloco):
+        fim = min(inicio + bloco, n)
+        if distancias.tipo == "GEO":
+            q1 = np.cos(lon[inicio:fim, None] - lon[None, :])
+            q2 = np.cos(lat[inicio:fim, None] - lat[None, :])
+            q3 = np.cos(lat[inicio:fim, None] + lat[None, :])
+            cosseno = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+            d = np.trunc(6378.388 * np.arccos(cosseno) + 1.0)
+            linhas = np.arange(inicio, fim)
+            d[linhas - inicio, linhas] = 0.0
+            matriz[inicio:fim] = d
+            continue
+        d = np.hypot(coords[inicio:fim, None, 0] - coords[None, :, 0],
+                     coords[inicio:fim, None, 1] - coords[None, :, 1])
+        if distancias.tipo == "EUC_2D":
+            d = np.floor(d + 0.5)
+        elif distancias.tipo == "CEIL_2D":
+            d = np.ceil(d)
+        matriz[inicio:fim] = d
+    matriz.flush()
+    return matriz
+
+class DistanciasMatriz:
+    """Distâncias lidas de uma matriz float32 mapeada em memória (np.load com mmap)."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.matriz = np.load(caminho, mmap_mode="r")
+
+    def __len__(self):
+        return len(self.matriz)
+
+    def chave(self):
+        return ("matriz", self.caminho)
+
+    def distancia(self, i, j):
+        return float(self.matriz[i, j])
+
+# --------------------------------------------------------------------------
+# 3. LISTA DE VIZINHOS MAIS PRÓXIMOS (candidatos para o 2-opt)
+# --------------------------------------------------------------------------
+
+def vizinhos_mais_proximos(coords, k=10, bloco=1024):
+    """
+    Para cada cidade, as k mais próximas (pela distância euclidiana das
+    coordenadas). Calcula em blocos de linhas: memória O(bloco * n).
+    Retorna um array int32 (n, k).
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    k = min(k, n - 1)
+    vizinhos = np.empty((n, k), dtype=np.int32)
+    quadrados = (coords ** 2).sum(axis=1)
+    for inicio in range(0, n, bloco):
+        fim = min(inicio + bloco, n)
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b (um produto de matrizes por bloco)
+        d2 = quadrados[inicio:fim, None] + quadrados[None, :] - 2.0 * (coords[inicio:fim] @ coords.T)
+        d2[np.arange(fim - inicio), np.arange(inicio, fim)] = np.inf # ela mesma
+        mais_proximos = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        ordem = np.take_along_axis(d2, mais_proximos, axis=1).argsort(axis=1)
+        vizinhos[inicio:fim] = np.take_along_axis(mais_proximos, ordem, axis=1)
+    return vizinhos
+
+# --------------------------------------------------------------------------
+# 4. RECOZIMENTO SIMULADO PARA TSP GRANDE
+# --------------------------------------------------------------------------
+
+class TSPAnnealerGrande(UndoAnnealer):
+    """
+    TSP com distâncias vindas de um "backend" (DistanciasCoordenadas ou
+    DistanciasMatriz) e 2-opt guiado por vizinhos mais próximos.
+
+    Como no exercicio2.TSPAnnealer, o estado é a ordem de visita sem a cidade
+    `inicio`, que é fixa no começo e no fim. pos[c] é a posição da cidade c
+    no estado, para achar em O(1) onde está um vizinho. Estado e pos são
+    arrays NumPy: a inversão de um trecho longo é feita em C, não em Python.
+    """
+    copy_strategy = 'method'
+
+    def __init__(self, state, distancias, inicio=0, vizinhos=None, prob_vizinho=0.9):
+        self.dist = distancias
+        self.inicio = inicio
+        self.vizinhos = vizinhos
+        self.prob_vizinho = prob_vizinho if vizinhos is not None else 0.0
+        super(TSPAnnealerGrande, self).__init__(np.asarray(state, dtype=np.int64))
+        self._reindexar()
+
+    def _reindexar(self):
+        self.pos = np.zeros(len(self.dist), dtype=np.int64)
+        self.pos[self.state] = np.arange(len(self.state))
+
+    def snapshot(self):
+        return self.state.copy()
+
+    def restore(self, snapshot):
+        self.state = snapshot.copy()
+        self._reindexar()
+
+    def chave_calibracao(self):
+        return (type(self).__qualname__, self.inicio, self.dist.chave())
+
+    def _inverter(self, a, b):
+        """Inverte state[a:b] e atualiza as posições das cidades do trecho."""
+        self.state[a:b] = self.state[a:b][::-1]
+        self.pos[self.state[a:b]] = np.arange(a, b)
+
+    def move(self):
+        """
+        2-opt: inverte state[a:b] e retorna o delta (só as duas arestas das pontas).
+        Com prob_vizinho, escolhe o trecho para criar a aresta (c, v) entre uma
+        cidade c e um dos seus k vizinhos mais próximos v.
+        """
+        n = len(self.state)
+        if self.prob_vizinho and self.rng.random() < self.prob_vizinho:
+            pa = self.rng.randrange(n)
+            c = self.state[pa]
+            v = self.vizinhos[c, self.rng.randrange(self.vizinhos.shape[1])]
+            if v == self.inicio:
+                self._desfazer = (0, 0)
+                return 0
+            pv = int(self.pos[v])
+            # Depois da inversão, v fica logo após (ou logo antes de) c
+            a, b = (pa + 1, pv + 1) if pa < pv else (pv, pa)
+        else:
+            a = self.rng.randint(0, n)
+            b = self.rng.randint(0, n)
+            if a > b:
+                a, b = b, a
+
+        if b - a < 2:
+            self._desfazer = (0, 0)
+            return 0
+
+        d = self.dist.distancia
+        primeira = self.state[a]
+        ultima = self.state[b - 1]
+        antes = self.state[a - 1] if a > 0 else self.inicio
+        depois = self.state[b] if b < n else self.inicio
+        delta = (d(antes, ultima) + d(primeira, depois)
+                 - d(antes, primeira) - d(ultima, depois))
+
+        self._inverter(a, b)
+        self._desfazer = (a, b)
+        return delta
+
+    def undo(self):
+        a, b = self._desfazer
+        self._inverter(a, b)
+
+    def energy(self):
+        """Comprimento total da rota, saindo e voltando a `inicio`."""
+        d = self.dist.distancia
+        rota = self.state.tolist()
+        distancia = d(self.inicio, rota[0]) + d(rota[-1], self.inicio)
+        for i in range(len(rota) - 1):
+            distancia += d(rota[i], rota[i + 1])
+        return distancia
@@ -0,0 +1,177 @@
+import numpy as np
+
+# --------------------------------------------------------------------------
+# RECOZIMENTO VETORIZADO: MUITAS CADEIAS EM PASSO SINCRONIZADO (NumPy)
+# --------------------------------------------------------------------------
+#
+# Em vez de um laço Python por cadeia, as K cadeias ficam numa matriz
+# (uma linha por cadeia). A cada iteração sorteamos K movimentos, calculamos
+# K deltas e aplicamos K decisões de Metropolis com operações de array.
+# O resfriamento é o mesmo do anneal(): geométrico de Tmax até Tmin.
+
+def _temperatura(Tmax, Tmin, step, steps):
+    return Tmax * (Tmin / Tmax) ** (step / steps)
+
+def anneal_mochila_vetorizado(pesos, valores, capacidade, cadeias=1000, Tmax=25000,
+                              Tmin=2.5, steps=50000, semente=0, obrigatorios=()):
+    """
+    Mochila 0/1 com `cadeias` cadeias independentes em uma matriz booleana
+    X (cadeias x n). Metade dos movimentos inverte um item (adiciona ou
+    remove); a outra metade troca um item de dentro por um de fora.
+    Movimentos que estouram a capacidade ou tiram o último item de
+    `obrigatorios` são rejeitados, então toda cadeia segue viável.
+
+    Retorna (melhor_estado, melhor_energia, energias), como o multi_start():
+    energias é o array com a melhor energia de cada cadeia.
+    """
+    rng = np.random.default_rng(semente)
+    pesos = np.asarray(pesos, dtype=np.float64)
+    valores = np.asarray(valores, dtype=np.float64)
+    n = len(pesos)
+    K = cadeias
+    linhas = np.arange(K)
+
+    eh_obrigatorio = np.zeros(n, dtype=np.int64)
+    eh_obrigatorio[list(obrigatorios)] = 1
+
+    # Estado inicial: vazio, ou só com o obrigatório mais leve
+    X = np.zeros((K, n), dtype=bool)
+    if obrigatorios:
+        X[:, min(obrigatorios, key=lambda i: pesos[i])] = True
+    W = X @ pesos
+    V = X @ valores
+    R = X @ eh_obrigatorio
+
+    melhor_X = X.copy()
+    melhor_V = V.copy()
+
+    for step in range(1, steps + 1):
+        T = _temperatura(Tmax, Tmin, step, steps)
+
+        i = rng.integers(n, size=K)
+        j = rng.integers(n, size=K)
+        troca = rng.random(K) < 0.5
+        xi = X[linhas, i]
+        xj = X[linhas, j]
+        # A troca só vale se exatamente um dos dois itens está dentro
+        troca &= xi != xj
+
+        si = np.where(xi, -1, 1)
+        sj = np.where(troca, np.where(xj, -1, 1), 0)
+        novo_W = W + si * pesos[i] + sj * pesos[j]
+        novo_V = V + si * valores[i] + sj * valores[j]
+        novo_R = R + si * eh_obrigatorio[i] + sj * eh_obrigatorio[j]
+
+        viavel = novo_W <= capacidade
+        if obrigatorios:
+            viavel &= novo_R > 0
+
+        # Energia = -valor; aceita se melhora ou pela regra de Metropolis
+        dE = V - novo_V
+        with np.errstate(over="ignore"):
+            aceita = viavel & ((dE <= 0.0) | (rng.random(K) < np.exp(-dE / T)))
+
+        X[linhas[aceita], i[aceita]] ^= True
+        troca_aceita = aceita & troca
+        X[linhas[troca_aceita], j[troca_aceita]] ^= True
+        W = np.where(aceita, novo_W, W)
+        V = np.where(aceita, novo_V, V)
+        R = np.where(aceita, novo_R, R)
+
+        melhorou = V > melhor_V
+        if melhorou.any():
+            melhor_X[melhorou] = X[melhorou]
+            melhor_V[melhorou] = V[melhorou]
+
+    energias = -melhor_V
+    k = int(np.argmin(energias))
+    return np.flatnonzero(melhor_X[k]).tolist(), float(energias[k]), energias
+
+def anneal_tsp_vetorizado(dist, inicio=0, cadeias=1000, Tmax=1000000, Tmin=0.1,
+                          steps=100000, semente=0):
+    """
+    TSP (2-opt) com `cadeias` permutações numa matriz inteira. Cada linha é
+    a rota completa [inicio, ..., inicio]; o 2-opt inverte um trecho
+    interno e o delta vem das duas arestas das pontas, como no TSPAnnealer.
+
+    Retorna (melhor_rota_sem_inicio, melhor_distancia, distancias).
+    """
+    rng = np.random.default_rng(semente)
+    D = np.asarray(dist, dtype=np.float64)
+    cidades = np.array([c for c in range(len(D)) if c != inicio])
+    m = len(cidades)
+    K = cadeias
+    linhas = np.arange(K)
+    colunas = np.arange(m + 2)
+
+    # Rotas com o início fixo nas colunas 0 e m+1
+    rotas = np.empty((K, m + 2), dtype=np.int64)
+    rotas[:, 0] = inicio
+    rotas[:, -1] = inicio
+    rotas[:, 1:-1] = rng.permuted(np.tile(cidades, (K, 1)), axis=1)
+    E = D[rotas[:, :-1], rotas[:, 1:]].sum(axis=1)
+
+    melhor_rotas = rotas.copy()
+    melhor_E = E.copy()
+
+    for step in range(1, steps + 1):
+        T = _temperatura(Tmax, Tmin, step, steps)
+
+        # Inverte as colunas lo+1..hi (o trecho state[lo:hi] do TSPAnnealer)
+        a = rng.integers(m + 1, size=K)
+        b = rng.integers(m + 1, size=K)
+        lo = np.minimum(a, b)
+        hi = np.maximum(a, b)
+        valido = hi - lo >= 2
+
+        antes = rotas[linhas, lo]
+        primeira = rotas[linhas, lo + 1]
+        ultima = rotas[linhas, hi]
+        depois = rotas[linhas, np.minimum(hi + 1, m + 1)]
+        dE = D[antes, ultima] + D[primeira, depois] - D[antes, primeira] - D[ultima, depois]
+
+        with np.errstate(over="ignore"):
+            aceita = valido & ((dE <= 0.0) | (rng.random(K) < np.exp(-dE / T)))
+
+        r = np.flatnonzero(aceita)
+        if len(r):
+            l = lo[r, None] + 1
+            h = hi[r, None]
+            indices = np.where((colunas >= l) & (colunas <= h), l + h - colunas, colunas)
+            rotas[r] = np.take_along_axis(rotas[r], indices, axis=1)
+            E[r] += dE[r]
+
+            melhorou = E < melhor_E
+            if melhorou.any():
+                melhor_rotas[melhorou] = rotas[melhorou]
+                melhor_E[melhorou] = E[melhorou]
+
+    k = int(np.argmin(melhor_E))
+    return melhor_rotas[k, 1:-1].tolist(), float(melhor_E[k]), melhor_E
+
+# --------------------------------------------------------------------------
+# EXEMPLO: 1000 cadeias dos Exercícios 1 e 2 de uma vez
+# --------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import time
+    import exercicio1
+    import exercicio2
+
+    inicio = time.perf_counter()
+    estado, energia, energias = anneal_mochila_vetorizado(
+        exercicio1.precos, exercicio1.gostos, exercicio1.BUDGET_MAX,
+        cadeias=1000, Tmax=25, Tmin=0.5, steps=2000, semente=42)
+    duracao = time.perf_counter() - inicio
+    exercicio1.print_solution(estado, "Vetorizado: Exercício 1 (1000 cadeias)")
+    print(f"{1000 * 2000 / duracao:,.0f} avaliações/s; "
+          f"cadeias no ótimo: {(energias == energias.min()).mean():.0%}")
+
+    inicio = time.perf_counter()
+    rota, distancia, distancias = anneal_tsp_vetorizado(
+        exercicio2.dist_km, exercicio2.start_idx,
+        cadeias=1000, Tmax=5000, Tmin=10, steps=5000, semente=42)
+    duracao = time.perf_counter() - inicio
+    exercicio2.print_solution(rota, distancia, "Vetorizado: Exercício 2 (1000 cadeias)")
+    print(f"{1000 * 5000 / duracao:,.0f} avaliações/s; "
+          f"cadeias no ótimo: {(distancias == distancias.min()).mean():.0%}")